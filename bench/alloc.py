@@ -0,0 +1,84 @@
+"""Allocation check for the ILI9341 command path.
+
+Run on the board with core/ili9341.py uploaded:
+
+    mpremote connect COM5 run bench/alloc.py
+
+The display is driven through a fake SPI bus and fake pins, so no panel is
+needed.  Each call is made under micropython.heap_lock(), where any heap
+allocation raises MemoryError; gc.mem_alloc() deltas are reported as well.
+"""
+import gc
+import micropython  # type: ignore
+
+from ili9341 import Display
+
+CALLS = 1000
+
+
+class FakePin(object):
+    """Pin stand-in accepting the calls Display makes."""
+    OUT = 1
+
+    def init(self, mode, value=0):
+        pass
+
+    def __call__(self, value):
+        pass
+
+
+class FakeSPI(object):
+    """SPI stand-in that counts writes and bytes."""
+
+    def __init__(self):
+        self.writes = 0
+        self.nbytes = 0
+
+    def write(self, data):
+        self.writes += 1
+        self.nbytes += len(data)
+
+    def deinit(self):
+        pass
+
+
+def check(name, fn):
+    fn()  # warm up: first call may intern attributes
+    gc.collect()
+    before = gc.mem_alloc()
+    micropython.heap_lock()
+    try:
+        for _ in range(CALLS):
+            fn()
+        error = None
+    except MemoryError as e:
+        error = e
+    finally:
+        micropython.heap_unlock()
+    allocated = gc.mem_alloc() - before
+    ok = error is None and allocated == 0
+    print('{0:<12} {1:>6} bytes  {2}'.format(
+        name, allocated, 'ok' if ok else 'ALLOCATES'))
+    return ok
+
+
+def main():
+    spi = FakeSPI()
+    display = Display(spi, cs=FakePin(), dc=FakePin(), rst=FakePin())
+    pixels = bytearray(2 * 16)
+    view = display.cmd_args(1)
+
+    results = (
+        check('block', lambda: display.block(10, 20, 13, 23, pixels)),
+        check('draw_pixel', lambda: display.draw_pixel(5, 6, 0xF800)),
+        check('scroll', lambda: display.scroll(40)),
+        check('set_scroll', lambda: display.set_scroll(16, 16)),
+        check('cmd_view', lambda: display.write_cmd_view(display.MADCTL, view)),
+    )
+    print('spi writes: {0}, bytes: {1}'.format(spi.writes, spi.nbytes))
+    if not all(results):
+        raise SystemExit('FAIL: allocation on the command path')
+    print('PASS')
+
+
+main()
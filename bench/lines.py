@@ -0,0 +1,83 @@
+"""Line engine benchmark: block transactions for the gauge needle angles.
+
+Run on the board with core/*.py uploaded:
+
+    mpremote connect COM5 run bench/lines.py
+
+Every needle position of both gauges is drawn three ways and the number of
+Display.block calls (one CASET/PASET/RAMWR/data sequence each) is counted:
+
+    legacy   one block per pixel (the old draw_line)
+    spans    draw_line, one block per Bresenham run
+    batch    draw_lines_batch on a known background, one block per window
+"""
+import time
+
+from config import display_ili9341_config
+from geometry import NeedleTable
+
+# (cx, cy, needle_len, max_value) as in main.OuterDisplay
+GAUGES = (
+    (120, 80, 56, 200),
+    (120, 240, 56, 8000),
+)
+MIN_RATIO = 5
+
+
+class BlockCounter(object):
+    """Count Display.block calls by wrapping the bound method."""
+
+    def __init__(self, display):
+        self.count = 0
+        self._block = display.block
+        display.block = self.block
+
+    def block(self, x0, y0, x1, y1, data):
+        self.count += 1
+        self._block(x0, y0, x1, y1, data)
+
+
+def needle_ends():
+    for cx, cy, length, max_value in GAUGES:
+        table = NeedleTable(cx, cy, length, max_value)
+        for i in range(table.count):
+            x = table.xy[2 * i]
+            y = table.xy[2 * i + 1]
+            yield cx, cy, x, y
+
+
+def run(display, counter, mode):
+    counter.count = 0
+    pixels = 0
+    start = time.ticks_ms()
+    for cx, cy, x, y in needle_ends():
+        pixels += max(abs(x - cx), abs(y - cy)) + 1
+        if mode == 'spans':
+            display.draw_line(cx, cy, x, y, 0xFFFF)
+            display.draw_line(cx, cy, x, y, 0)
+        else:
+            display.draw_lines_batch((cx, cy, x, y), 0xFFFF, 0)
+            display.draw_lines_batch((cx, cy, x, y), 0, 0)
+    return counter.count, pixels * 2, time.ticks_diff(time.ticks_ms(), start)
+
+
+def main():
+    display = display_ili9341_config()
+    display.clear()
+    counter = BlockCounter(display)
+
+    spans, legacy, spans_ms = run(display, counter, 'spans')
+    batch, _, batch_ms = run(display, counter, 'batch')
+
+    print('needle draws: {0}'.format(2 * sum(1 for _ in needle_ends())))
+    print('legacy blocks: {0}'.format(legacy))
+    print('spans  blocks: {0} ({1:.1f}x fewer, {2} ms)'.format(
+        spans, legacy / spans, spans_ms))
+    print('batch  blocks: {0} ({1:.1f}x fewer, {2} ms)'.format(
+        batch, legacy / batch, batch_ms))
+    if legacy / batch < MIN_RATIO:
+        raise SystemExit('FAIL: batch reduction below {0}x'.format(MIN_RATIO))
+    print('PASS')
+
+
+main()
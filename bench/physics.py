@@ -0,0 +1,149 @@
+"""Fixed-point physics check: equivalence with the float model, no allocation.
+
+On the host, from the repository root:
+
+    python bench/physics.py
+
+On the board (core/physics.py uploaded), which also checks that the
+helpers do not allocate under micropython.heap_lock():
+
+    mpremote connect COM5 run bench/physics.py
+
+The float functions below are the model ESP32 used before fuel moved to
+milli-percent and the idle wobble to a sine table.
+"""
+import math
+import sys
+
+try:
+    import micropython  # type: ignore
+except ImportError:
+    micropython = None
+    sys.path.insert(0, 'core')
+
+from physics import FUEL_SCALE, RATE_SCALE, wobble_table, idle_rpm, speed_rpm, burn_rate
+
+MAX_SPEED = 200
+MAX_RPM = 8000
+IDLE_RPM = 800
+WOBBLE_AMPL = 80
+WOBBLE_PERIOD_MS = 900
+NOISE_AMPL = 25
+FUEL_BASE_PER_SEC = 0.5
+FUEL_MAX_PER_SEC = 2
+
+
+def float_idle_rpm(now):
+    phase = (now % WOBBLE_PERIOD_MS) / WOBBLE_PERIOD_MS
+    wobble = math.sin(2 * math.pi * phase) * WOBBLE_AMPL
+    noise = ((now // 37) % (2 * NOISE_AMPL + 1)) - NOISE_AMPL
+    rpm = IDLE_RPM + wobble + noise
+    if rpm < 0:
+        rpm = 0
+    if rpm > MAX_RPM:
+        rpm = MAX_RPM
+    return int(rpm)
+
+
+def float_speed_rpm(speed):
+    ratio = speed / MAX_SPEED
+    ratio = max(0, min(1, ratio))
+    return int(IDLE_RPM + ratio * (MAX_RPM - IDLE_RPM))
+
+
+def float_burn(rpm, dt_ms):
+    rpm_ratio = rpm / MAX_RPM
+    rpm_ratio = 0 if rpm_ratio < 0 else (1 if rpm_ratio > 1 else rpm_ratio)
+    burn_per_sec = FUEL_BASE_PER_SEC + rpm_ratio * (FUEL_MAX_PER_SEC - FUEL_BASE_PER_SEC)
+    return burn_per_sec * (dt_ms / 1000.0)
+
+
+def report(name, diffs, total, worst):
+    print('{0:<12} {1:>6} of {2:>6} differ, worst {3}'.format(
+        name, diffs, total, worst))
+
+
+def check_idle(table):
+    diffs = 0
+    worst = 0
+    n = 60000
+    for now in range(n):
+        d = abs(idle_rpm(now, IDLE_RPM, table, NOISE_AMPL, MAX_RPM) - float_idle_rpm(now))
+        if d:
+            diffs += 1
+            worst = max(worst, d)
+    report('idle rpm', diffs, n, worst)
+    return worst <= 1
+
+
+def check_speed():
+    diffs = 0
+    worst = 0
+    for speed in range(MAX_SPEED + 1):
+        d = abs(speed_rpm(speed, MAX_SPEED, IDLE_RPM, MAX_RPM) - float_speed_rpm(speed))
+        if d:
+            diffs += 1
+            worst = max(worst, d)
+    report('speed rpm', diffs, MAX_SPEED + 1, worst)
+    return worst <= 1
+
+
+def check_burn():
+    # Ten minutes of 10 ms steps sweeping rpm, as burn_fuel sees them
+    fuel = 100.0
+    fuel_mp = 100 * FUEL_SCALE
+    rem = 0
+    steps = 60000
+    for i in range(steps):
+        rpm = IDLE_RPM + (i * 7) % (MAX_RPM - IDLE_RPM + 1)
+        dt_ms = 10 + i % 3
+        fuel -= float_burn(rpm, dt_ms)
+        burned = burn_rate(rpm, MAX_RPM, 500000, 2000000) * dt_ms + rem
+        rem = burned % RATE_SCALE
+        fuel_mp -= burned // RATE_SCALE
+    drift = abs(fuel - fuel_mp / FUEL_SCALE)
+    print('{0:<12} float {1:.3f}%  fixed {2:.3f}%  drift {3:.4f}%'.format(
+        'fuel burn', fuel, fuel_mp / FUEL_SCALE, drift))
+    return drift < 0.01
+
+
+def check_alloc(table):
+    import gc
+    calls = (
+        ('idle_rpm', lambda: idle_rpm(12345, IDLE_RPM, table, NOISE_AMPL, MAX_RPM)),
+        ('speed_rpm', lambda: speed_rpm(123, MAX_SPEED, IDLE_RPM, MAX_RPM)),
+        ('burn_rate', lambda: burn_rate(4567, MAX_RPM, 500000, 2000000)),
+    )
+    ok = True
+    for name, fn in calls:
+        fn()
+        gc.collect()
+        before = gc.mem_alloc()
+        micropython.heap_lock()
+        try:
+            for _ in range(1000):
+                fn()
+            error = None
+        except MemoryError as e:
+            error = e
+        finally:
+            micropython.heap_unlock()
+        allocated = gc.mem_alloc() - before
+        good = error is None and allocated == 0
+        print('{0:<12} {1:>6} bytes  {2}'.format(
+            name, allocated, 'ok' if good else 'ALLOCATES'))
+        ok = ok and good
+    return ok
+
+
+def main():
+    table = wobble_table(WOBBLE_AMPL, WOBBLE_PERIOD_MS)
+    results = [check_idle(table), check_speed(), check_burn()]
+    if micropython is not None:
+        results.append(check_alloc(table))
+    if not all(results):
+        raise SystemExit('FAIL: fixed-point physics differs from the float model')
+    print('PASS')
+
+
+main()
@@ -0,0 +1,381 @@
+"""Benchmark suite: Display primitives and dashboard scenarios.
+
+On the host, through the headless simulator (from the repository root):
+
+    python bench/suite.py run                      # print results
+    python bench/suite.py run -o bench/baselines/host.json
+    python bench/suite.py compare bench/baselines/host.json new.json
+
+On the board (core/ uploaded, both panels attached):
+
+    mpremote connect COM5 run bench/suite.py > board.log
+
+The board run prints one 'BENCH {json}' line; compare and run -o accept
+such a log wherever they take a JSON file.
+
+Primitives are timed on the ILI9341 (us and SPI bytes per call);
+frame_inline and frame_threaded redraw both panels through a
+RenderPipeline without and with its worker thread.  The
+scenarios drive ESP32 with injected inputs in 10 ms steps and report
+frames drawn, sustainable frames/s (1e6 / mean frame time), worst frame
+time, SPI bytes on both panels (from profiler.PROFILE) and GC collections.
+On the host the simulation clock is virtual and frame times are wall time
+of the Python code; on the board both are real.
+"""
+import gc
+import json
+import sys
+import time
+
+MICROPYTHON = sys.implementation.name == 'micropython'
+
+if not MICROPYTHON:
+    import os
+    ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, ROOT)
+    import sim
+    CLOCK = sim.install()
+    CWD = os.getcwd()
+    os.chdir(sim.CORE)  # main opens icons.bin relative to core
+
+    def now_us():
+        return int(time.perf_counter() * 1000000)
+
+    def gc_count():
+        return sum(s['collections'] for s in gc.get_stats())
+else:
+    CLOCK = None
+    now_us = time.ticks_us
+
+    def gc_count():
+        return 0  # MicroPython has no counter; Probe watches mem_alloc drops
+
+from profiler import PROFILE  # noqa: E402
+
+TICK_MS = 10
+PRIMITIVE_CALLS = 20 if MICROPYTHON else 200
+IDLE_MS = 10000
+STEP_LIMIT = 3000  # Safety stop for scenarios that wait for a state
+REGRESSION_PCT = 10
+# Metrics where a larger value is better; everything else should shrink
+HIGHER_IS_BETTER = ('fps',)
+TIMING_METRICS = ('fps', 'worst_us', 'us')  # Noisy on a shared host
+
+
+def spi_bytes():
+    """Return SPI bytes counted by the profiler so far (all panels)."""
+    return sum(s['cmd_bytes'] + s['pixel_bytes']
+               for s in PROFILE.stats().values())
+
+
+class Probe(object):
+    """Frame time, SPI byte and GC counters for one scenario."""
+
+    def __init__(self):
+        gc.collect()
+        self.frames = 0
+        self.total_us = 0
+        self.worst_us = 0
+        self.gc = 0
+        self._gc0 = gc_count()
+        self._mem = gc.mem_alloc() if MICROPYTHON else 0
+        self._bytes0 = spi_bytes()
+
+    def frame(self, us, drawn):
+        if drawn:
+            self.frames += 1
+            self.total_us += us
+            if us > self.worst_us:
+                self.worst_us = us
+        if MICROPYTHON:
+            mem = gc.mem_alloc()
+            if mem < self._mem:
+                self.gc += 1
+            self._mem = mem
+
+    def result(self):
+        return {
+            'frames': self.frames,
+            'fps': (self.frames * 1000000 // self.total_us
+                    if self.total_us else 0),
+            'worst_us': self.worst_us,
+            'spi_bytes': spi_bytes() - self._bytes0,
+            'gc': self.gc + gc_count() - self._gc0,
+        }
+
+
+def advance(elapsed_us):
+    """Let one TICK_MS of simulation time pass."""
+    if CLOCK is not None:
+        CLOCK.advance(TICK_MS)
+    else:
+        rest = TICK_MS - elapsed_us // 1000
+        if rest > 0:
+            time.sleep_ms(rest)
+
+
+def run_steps(esp, probe, done, inject=None):
+    """Step and render esp until done() or STEP_LIMIT steps."""
+    for _ in range(STEP_LIMIT):
+        if done():
+            break
+        t0 = now_us()
+        if inject is not None:
+            inject()
+        esp.step()
+        outer = esp.outer_display
+        drawn = esp.dirty or (outer.animating() and
+                              outer.frame_wait(time.ticks_ms()) == 0)
+        esp.render()
+        us = now_us() - t0
+        probe.frame(us, drawn)
+        advance(us)
+
+
+def hold_gas(esp, pressed):
+    """Replace esp.read_buttons so the refuel button reads as held."""
+    if not pressed:
+        if 'read_buttons' in esp.__dict__:
+            del esp.read_buttons
+        return
+
+    def read_buttons(now):
+        esp.left_pressed = False
+        esp.right_pressed = False
+        esp.gas_pressed = True
+    esp.read_buttons = read_buttons
+
+
+def scenario_boot():
+    import main  # type: ignore
+    probe = Probe()
+    t0 = now_us()
+    outer = main.OuterDisplay(max_speed=200, max_rpm=8000)
+    esp = main.ESP32(outer_display=outer, max_speed=200, max_rpm=8000,
+                     idle_rpm=800)
+    esp.dirty = True
+    esp.render()
+    probe.frame(now_us() - t0, True)
+    return esp, probe.result()
+
+
+def scenario_idle(esp):
+    from physics import FUEL_FULL  # type: ignore
+    esp.curr_speed = 0
+    esp.curr_fuel_mp = FUEL_FULL
+    probe = Probe()
+    end = time.ticks_add(time.ticks_ms(), IDLE_MS)
+    run_steps(esp, probe, lambda: time.ticks_diff(end, time.ticks_ms()) <= 0)
+    return probe.result()
+
+
+def scenario_sweep(esp):
+    from physics import FUEL_FULL  # type: ignore
+    esp.curr_speed = 0
+    esp.curr_fuel_mp = FUEL_FULL
+
+    def press():
+        esp.throttle_presses = 1
+    probe = Probe()
+    run_steps(esp, probe, lambda: esp.curr_speed >= esp.max_speed, press)
+    return probe.result()
+
+
+def scenario_refuel(esp):
+    from physics import FUEL_FULL  # type: ignore
+    esp.curr_speed = 0
+    esp.curr_fuel_mp = 0
+    esp.last_refuel_ms = time.ticks_ms()
+    hold_gas(esp, True)
+    probe = Probe()
+    try:
+        run_steps(esp, probe, lambda: esp.curr_fuel_mp >= FUEL_FULL)
+    finally:
+        hold_gas(esp, False)
+    return probe.result()
+
+
+def time_primitive(fn):
+    fn()  # warm up caches (glyphs, scratch buffers)
+    gc.collect()
+    bytes0 = spi_bytes()
+    t0 = now_us()
+    for _ in range(PRIMITIVE_CALLS):
+        fn()
+    us = now_us() - t0
+    return {
+        'us': us // PRIMITIVE_CALLS,
+        'bytes': (spi_bytes() - bytes0) // PRIMITIVE_CALLS,
+    }
+
+
+def primitives(display):
+    display.regions.reset()  # whole panel, normal mode
+    buf = bytearray(16 * 16 * 2)
+    cases = [
+        ('block_16x16', lambda: display.block(10, 10, 25, 25, buf)),
+        ('draw_line', lambda: display.draw_line(10, 20, 200, 300, 0xFFFF)),
+        ('draw_line_needle', lambda: display.draw_line(120, 80, 80, 41, 0xFFFF)),
+        ('draw_hline', lambda: display.draw_hline(0, 100, 240, 0xFFFF)),
+        ('fill_rectangle', lambda: display.fill_rectangle(20, 20, 100, 100, 0x07E0)),
+        ('clear', lambda: display.clear(0)),
+    ]
+    for rotate in (0, 90, 180, 270):
+        cases.append(('draw_text8x8_{0}'.format(rotate),
+                      lambda r=rotate: display.draw_text8x8(
+                          60, 60, '8000', 0xFFFF, 0, rotate=r)))
+    return dict((name, time_primitive(fn)) for name, fn in cases)
+
+
+def needle_primitives(esp):
+    """Time a 5 km/h speed needle redraw near 45 degrees, jagged and anti-aliased."""
+    from main import SPEED_COLOR  # type: ignore
+    from coverage import CoverageTable  # type: ignore
+    outer = esp.outer_display
+    saved = outer.coverage
+    flip = [0]
+
+    def redraw():
+        flip[0] ^= 1
+        outer._draw_needle(outer.cx_speed, outer.cy_speed, 130 + 5 * flip[0],
+                           esp.max_speed, SPEED_COLOR, 'prev_speed_value')
+    results = {}
+    for name, coverage in (('needle_5kmh', None),
+                           ('needle_5kmh_aa', saved or CoverageTable(outer.needles.values()))):
+        outer.coverage = coverage
+        results[name] = time_primitive(redraw)
+    outer.coverage = saved
+    return results
+
+
+def pipeline_primitives(esp):
+    """Time a frame that redraws both panels, inline and with a worker thread."""
+    from pipeline import RenderPipeline  # type: ignore
+    from physics import FUEL_FULL  # type: ignore
+    outer = esp.outer_display
+    flip = [0]
+
+    def draw_outer():
+        flip[0] ^= 1
+        outer.update(100 + 40 * flip[0], 3000 + 2000 * flip[0],
+                     esp.max_speed, esp.max_rpm)
+
+    def draw_inner():
+        esp.display.draw_fuel_bars(FUEL_FULL * flip[0])
+    results = {}
+    for name, threaded in (('frame_inline', False), ('frame_threaded', True)):
+        pipeline = RenderPipeline(threaded)
+        try:
+            results[name] = time_primitive(
+                lambda p=pipeline: p.run(draw_outer, draw_inner))
+        finally:
+            pipeline.close()
+    return results
+
+
+def run_all():
+    """Run every scenario and primitive; return the results dict."""
+    PROFILE.enable()
+    esp, boot = scenario_boot()
+    results = {
+        'target': 'board' if MICROPYTHON else 'host',
+        'scenarios': {
+            'boot': boot,
+            'idle_10s': scenario_idle(esp),
+            'sweep_0_200': scenario_sweep(esp),
+            'refuel_0_100': scenario_refuel(esp),
+        },
+    }
+    results['primitives'] = needle_primitives(esp)
+    results['primitives'].update(pipeline_primitives(esp))
+    results['primitives'].update(primitives(esp.outer_display.display))
+    esp.close()
+    PROFILE.disable()
+    return results
+
+
+def load(path):
+    """Read results from a JSON file or a log with a 'BENCH {json}' line."""
+    with open(path) as f:
+        text = f.read()
+    for line in text.splitlines():
+        if line.startswith('BENCH '):
+            return json.loads(line[6:])
+    return json.loads(text)
+
+
+def compare(old, new, threshold=REGRESSION_PCT, counts_only=False):
+    """Print old vs new for every shared metric.
+
+    Args:
+        old, new (dict): Results from run_all().
+        threshold (Optional float): Percent change counted as a regression.
+        counts_only (Optional bool): Skip timing metrics (default False).
+    Returns:
+        list: (group, name, metric, percent) of regressions beyond
+        threshold percent.
+    """
+    regressions = []
+    print('{0:<30}{1:>12}{2:>12}{3:>9}'.format('metric', 'old', 'new', 'change'))
+    for group in ('scenarios', 'primitives'):
+        for name in sorted(old.get(group, {})):
+            if name not in new.get(group, {}):
+                continue
+            a = old[group][name]
+            b = new[group][name]
+            for metric in sorted(a):
+                if metric not in b or (counts_only and
+                                        metric in TIMING_METRICS):
+                    continue
+                pct = ((b[metric] - a[metric]) * 100.0 / a[metric]
+                       if a[metric] else 0.0)
+                worse = -pct if metric in HIGHER_IS_BETTER else pct
+                flag = ' !' if worse > threshold else ''
+                if flag:
+                    regressions.append((group, name, metric, pct))
+                print('{0:<30}{1:>12}{2:>12}{3:>+8.1f}%{4}'.format(
+                    name + '.' + metric, a[metric], b[metric], pct, flag))
+    return regressions
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    sub = parser.add_subparsers(dest='command')
+    run = sub.add_parser('run', help='run the suite in the simulator')
+    run.add_argument('-o', '--output', help='write results (JSON) here')
+    run.add_argument('--from-log', help='convert a board log instead of running')
+    cmp = sub.add_parser('compare', help='diff two result files')
+    cmp.add_argument('old')
+    cmp.add_argument('new')
+    cmp.add_argument('--threshold', type=float, default=REGRESSION_PCT,
+                     help='percent change reported as a regression')
+    cmp.add_argument('--counts-only', action='store_true',
+                     help='compare SPI bytes, frames and GC only, not times')
+    args = parser.parse_args(argv)
+
+    def path(name):  # the simulator runs in core/
+        return os.path.join(CWD, name)
+
+    if args.command == 'compare':
+        regressions = compare(load(path(args.old)), load(path(args.new)),
+                              args.threshold, args.counts_only)
+        if regressions:
+            raise SystemExit('FAIL: {0} metrics regressed more than {1}%'.format(
+                len(regressions), args.threshold))
+        print('PASS')
+        return
+    if args.command != 'run':
+        parser.error('choose run or compare')
+    results = load(path(args.from_log)) if args.from_log else run_all()
+    text = json.dumps(results, indent=1, sort_keys=True)
+    if args.output:
+        with open(path(args.output), 'w') as f:
+            f.write(text + '\n')
+    print(text)
+
+
+if MICROPYTHON:
+    print('BENCH ' + json.dumps(run_all()))
+elif __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Needle animation: displayed values chase their targets in real time.
+
+A needle keeps its displayed value in fixed point (FRAC fraction bits) and
+closes the gap to the target by a factor looked up per elapsed millisecond
+in a response table, so the motion depends on time only, not on how often
+it is sampled.  A frame that comes late lands further along the same
+curve; frames the panel had no time for are skipped, never queued.
+"""
+import math
+import time
+from array import array
+
+FRAC = 4  # fraction bits of the displayed value
+KEEP_BITS = 10  # response table fixed point: 1 << KEEP_BITS keeps the whole gap
+FRAME_MS = 33  # animation frame period (about 30 frames/s)
+
+
+def response_table(tau_ms, bits=KEEP_BITS):
+    """Return the share of the gap left after t ms of exponential approach.
+
+    Args:
+        tau_ms (int): Time constant; the gap shrinks to 37% per tau_ms.
+        bits (Optional int): Fixed point of the entries (default KEEP_BITS).
+    Returns:
+        array: round(exp(-t / tau_ms) << bits) for t in range(5 * tau_ms).
+    Note:
+        Past the end of the table less than 1% of the gap is left and the
+        needle snaps to its target.  Any non-increasing table starting at
+        1 << bits is a valid response curve.
+    """
+    one = 1 << bits
+    return array('H', [int(one * math.exp(-t / tau_ms) + 0.5)
+                       for t in range(5 * tau_ms)])
+
+
+class Needle(object):
+    """Displayed value of one gauge moving towards its target.
+
+    Note:  gap * table[t] stays below 2**30 for targets up to 2**(30 -
+    FRAC - KEEP_BITS) = 65536, so advance() works on small ints only.
+    """
+
+    def __init__(self, table, settle=1, max_rate=0, frame_ms=FRAME_MS):
+        """Initialize needle.
+
+        Args:
+            table (array): Response curve, see response_table().
+            settle (Optional int): Gap (in value units) below which the
+                needle snaps to its target.
+            max_rate (Optional int): Slew limit in value units per second
+                (0: only the response curve limits the motion).
+            frame_ms (Optional int): Time credited to the first frame after
+                the needle starts from rest.
+        """
+        self.table = table
+        self.settle = settle << FRAC
+        self.max_rate = max_rate
+        self.frame_ms = frame_ms
+        self.target = 0
+        self.fx = 0
+        self.last_ms = 0
+
+    def set(self, target, now):
+        """Set the value to move to; the motion starts at now."""
+        if target == self.target:
+            return
+        if not self.moving():
+            # From rest: the first frame already moves by frame_ms
+            self.last_ms = time.ticks_add(now, -self.frame_ms)
+        self.target = target
+
+    def snap(self, target):
+        """Jump to target without animation."""
+        self.target = target
+        self.fx = target << FRAC
+
+    def moving(self):
+        """Return True while the displayed value has not reached the target."""
+        return self.fx != self.target << FRAC
+
+    def value(self):
+        """Return the displayed value rounded to whole units."""
+        return (self.fx + (1 << (FRAC - 1))) >> FRAC
+
+    def advance(self, now):
+        """Move along the response curve up to now and return value()."""
+        goal = self.target << FRAC
+        gap = goal - self.fx
+        dt = time.ticks_diff(now, self.last_ms)
+        if gap == 0 or dt <= 0:
+            self.last_ms = now
+            return self.value()
+        self.last_ms = now
+
+        table = self.table
+        left = (gap * table[dt]) >> KEEP_BITS if dt < len(table) else 0
+        if self.max_rate:
+            if dt > len(table):
+                dt = len(table)
+            limit = (self.max_rate * dt << FRAC) // 1000
+            if gap - left > limit:
+                left = gap - limit
+            elif left - gap > limit:
+                left = gap + limit
+        if -self.settle < left < self.settle:
+            left = 0
+        self.fx = goal - left
+        return self.value()
@@ -0,0 +1,146 @@
+"""Pre-encoded RGB565 icon packs.
+
+Built on the host by tools/pack_icons.py.  Layout (header fields little
+endian, pixels big-endian RGB565 as blit_buffer and Display.block expect):
+
+    header  '<4sHH'    magic b'R565', version, icon count
+    index   '<12sHHI'  name (NUL padded), width, height, data offset
+    data    width * height * 2 bytes per icon
+"""
+import struct
+
+MAGIC = b'R565'
+VERSION = 1
+HEADER = '<4sHH'
+ENTRY = '<12sHHI'
+HEADER_SIZE = struct.calcsize(HEADER)
+ENTRY_SIZE = struct.calcsize(ENTRY)
+
+
+class IconPack(object):
+    """Index of an icon pack file; pixels stay on flash until loaded."""
+
+    def __init__(self, path):
+        """Initialize icon pack.
+
+        Args:
+            path (string): Pack file path.
+        Raises:
+            ValueError: If the file is not a version 1 icon pack.
+        """
+        self.path = path
+        self.index = {}
+        with open(path, 'rb') as f:
+            magic, version, count = struct.unpack(HEADER, f.read(HEADER_SIZE))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError('{0} is not an icon pack.'.format(path))
+            table = f.read(count * ENTRY_SIZE)
+        for i in range(count):
+            name, w, h, offset = struct.unpack_from(ENTRY, table, i * ENTRY_SIZE)
+            self.index[name.rstrip(b'\0').decode()] = (w, h, offset)
+
+    def names(self):
+        """Return the icon names in the pack."""
+        return list(self.index)
+
+    def size(self, name):
+        """Return (width, height) of icon name."""
+        w, h, _ = self.index[name]
+        return w, h
+
+    def load(self, name):
+        """Return icon pixels as bytes, ready for blit_buffer or block."""
+        w, h, offset = self.index[name]
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return f.read(w * h * 2)
+
+    def load_into(self, name, buf):
+        """Read icon pixels into a preallocated buffer (no allocation).
+
+        Args:
+            name (string): Icon name.
+            buf (bytearray): At least width * height * 2 bytes.
+        Returns:
+            int: Number of bytes read.
+        """
+        w, h, offset = self.index[name]
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return f.readinto(memoryview(buf)[:w * h * 2])
+
+
+class IconCache(object):
+    """Bounded LRU set of icons resident in RAM, loaded from an IconPack.
+
+    Note:  Slots, each as large as the biggest icon in the pack, are
+    allocated up front, so loading an icon never allocates and RAM use
+    does not depend on which icons are shown.  There are never more slots
+    than icons in the pack.
+    """
+
+    def __init__(self, pack, capacity=4):
+        """Initialize icon cache.
+
+        Args:
+            pack (IconPack): Source of icon pixels.
+            capacity (Optional int): Number of icons kept in RAM (capped at
+                the number of icons in the pack).
+        """
+        self.pack = pack
+        capacity = min(capacity, len(pack.index))
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        size = max(w * h * 2 for w, h, _ in pack.index.values())
+        self._slots = [bytearray(size) for _ in range(capacity)]
+        self._views = [None] * capacity  # Pixels of the icon in each slot
+        self._names = [None] * capacity
+        self._stamps = [0] * capacity
+        self._stamp = 0
+
+    def get(self, name):
+        """Return pixels of icon name, loading it on a miss.
+
+        Returns:
+            memoryview: width * height * 2 bytes of big-endian RGB565.
+        """
+        self._stamp += 1
+        if self._stamp >= 0x3FFFFFFF:
+            self._renumber()
+        names = self._names
+        for i in range(self.capacity):
+            if names[i] == name:
+                self.hits += 1
+                self._stamps[i] = self._stamp
+                return self._views[i]
+        self.misses += 1
+        i = self._victim()
+        w, h = self.pack.size(name)
+        self.pack.load_into(name, self._slots[i])
+        self._views[i] = memoryview(self._slots[i])[:w * h * 2]
+        names[i] = name
+        self._stamps[i] = self._stamp
+        return self._views[i]
+
+    def resident(self):
+        """Return names of the icons currently in RAM."""
+        return [name for name in self._names if name is not None]
+
+    def _victim(self):
+        """Return a free slot or the least recently used one."""
+        stamps = self._stamps
+        victim = 0
+        for i in range(self.capacity):
+            if self._names[i] is None:
+                return i
+            if stamps[i] < stamps[victim]:
+                victim = i
+        return victim
+
+    def _renumber(self):
+        """Compact LRU stamps so they stay small ints."""
+        order = sorted(range(self.capacity), key=lambda i: self._stamps[i])
+        for rank, i in enumerate(order):
+            self._stamps[i] = rank
+        self._stamp = self.capacity
@@ -0,0 +1,131 @@
+"""Precomputed integer geometry for round gauges.
+
+All trigonometry happens once when the tables are built.  Lookups on the
+draw path are plain array('h') indexing, so they allocate no floats.
+"""
+import math
+from array import array
+
+START_ANGLE = 225
+TOTAL_SPAN = 270
+
+
+def polar(cx, cy, r, angle_deg):
+    """Return integer screen point at radius r and angle_deg from center.
+
+    Args:
+        cx, cy (int): Center point.
+        r (int): Radius.
+        angle_deg (float): Angle in degrees (0 = right, 90 = down).
+    """
+    rad = math.radians(angle_deg)
+    return int(cx + r * math.cos(rad)), int(cy + r * math.sin(rad))
+
+
+def value_to_angle_deg(value, max_value):
+    """Return dial angle in degrees for value on a 0..max_value scale."""
+    if max_value <= 0:
+        return START_ANGLE
+
+    ratio = value / max_value
+    ratio = max(0, min(1, ratio))
+
+    return START_ANGLE + ratio * TOTAL_SPAN
+
+
+class NeedleTable(object):
+    """Needle end points for every value bucket of a gauge.
+
+    Note:
+        Buckets are step units wide, with step chosen so the table holds
+        at most `buckets` + 1 entries.  For 0..200 km/h that is one entry
+        per km/h; for 0..8000 rpm it is one entry per 20 rpm, which moves
+        the needle tip by less than a pixel.
+    """
+
+    def __init__(self, cx, cy, length, max_value, buckets=400):
+        """Build needle table.
+
+        Args:
+            cx, cy (int): Gauge center.
+            length (int): Needle length in pixels.
+            max_value (int): Full scale value.
+            buckets (Optional int): Maximum number of value buckets.
+        """
+        self.cx = cx
+        self.cy = cy
+        self.length = length
+        self.max_value = max_value
+        max_value = max(int(max_value), 0)
+        self.step = max(1, (max_value + buckets - 1) // buckets)
+        self.count = (max_value + self.step - 1) // self.step + 1
+        self.half = self.step // 2
+        xy = array('h')
+        for i in range(self.count):
+            value = min(i * self.step, max_value)
+            x, y = polar(cx, cy, length,
+                         value_to_angle_deg(value, max_value))
+            xy.append(x)
+            xy.append(y)
+        self.xy = xy
+
+    def index(self, value):
+        """Return bucket index for integer value (clamped to the scale)."""
+        i = (int(value) + self.half) // self.step
+        if i < 0:
+            return 0
+        if i >= self.count:
+            return self.count - 1
+        return i
+
+    def end(self, value):
+        """Return needle tip (x, y) for value."""
+        i = self.index(value) << 1
+        return self.xy[i], self.xy[i + 1]
+
+
+def tick_segments(cx, cy, radius_outer, num_major=13, num_minor=4):
+    """Return dial tick end points as flat array('h') tables.
+
+    Args:
+        cx, cy (int): Gauge center.
+        radius_outer (int): Dial radius.
+        num_major (Optional int): Major ticks over the full span.
+        num_minor (Optional int): Minor ticks between two major ticks.
+    Returns:
+        tuple: (major, minor) arrays of x1, y1, x2, y2 quadruples.
+    """
+    major = array('h')
+    minor = array('h')
+    if num_major < 2:
+        return major, minor
+
+    step_major = TOTAL_SPAN / (num_major - 1)
+
+    for i in range(num_major):
+        angle_deg = START_ANGLE + i * step_major
+        for v in polar(cx, cy, radius_outer - 18, angle_deg):
+            major.append(v)
+        for v in polar(cx, cy, radius_outer - 2, angle_deg):
+            major.append(v)
+
+        if i < num_major - 1 and num_minor > 0:
+            step_minor = step_major / (num_minor + 1)
+
+            for j in range(1, num_minor + 1):
+                a = angle_deg + j * step_minor
+                for v in polar(cx, cy, radius_outer - 12, a):
+                    minor.append(v)
+                for v in polar(cx, cy, radius_outer - 4, a):
+                    minor.append(v)
+
+    return major, minor
+
+
+def circle_points(cx, cy, r, step_deg=3):
+    """Return dotted circle points as a flat array('h') of x, y pairs."""
+    xy = array('h')
+    for ang in range(0, 360, step_deg):
+        for v in polar(cx, cy, r, ang):
+            xy.append(v)
+    return xy
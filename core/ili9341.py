@@ -2,6 +2,7 @@
 from time import sleep
 from math import cos, sin, pi, radians
 from sys import implementation
+import gc
 from framebuf import FrameBuffer, RGB565  # type: ignore
 from micropython import const  # type: ignore
 
@@ -17,6 +18,318 @@ def color565(r, g, b):
     return (r & 0xf8) << 8 | (g & 0xfc) << 3 | b >> 3
 
 
+class GlyphCache(object):
+    """Bounded LRU cache of pre-rendered 8x8 RGB565 glyphs.
+
+    Note:  Glyphs are stored already rotated and byte swapped, so each one
+    is 128 bytes ready to be copied into a block write.
+    """
+
+    GLYPH_BYTES = const(128)  # 8 x 8 pixels x 2 bytes
+
+    def __init__(self, capacity=24):
+        """Initialize glyph cache.
+
+        Args:
+            capacity (Optional int): Maximum number of cached glyphs.
+        """
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._glyphs = {}  # (char, rotate, color, background) -> [buf, stamp]
+        self._stamp = 0
+
+    def get(self, char, rotate, color, background):
+        """Return cached glyph buffer, rendering it on a miss.
+
+        Args:
+            char (string): Single character.
+            rotate (int): 0, 90, 180 or 270.
+            color (int): RGB565 color value.
+            background (int): RGB565 background color.
+        """
+        self._stamp += 1
+        if self._stamp >= 0x3FFFFFFF:
+            self._renumber()
+        key = (char, rotate, color, background)
+        entry = self._glyphs.get(key)
+        if entry is not None:
+            self.hits += 1
+            entry[1] = self._stamp
+            return entry[0]
+        self.misses += 1
+        if len(self._glyphs) >= self.capacity:
+            self._evict()
+        buf = self._render(char, rotate, color, background)
+        self._glyphs[key] = [buf, self._stamp]
+        return buf
+
+    def clear(self):
+        """Drop all cached glyphs."""
+        self._glyphs = {}
+
+    def _evict(self):
+        """Drop the least recently used glyph."""
+        oldest = None
+        oldest_stamp = self._stamp + 1
+        for key, entry in self._glyphs.items():
+            if entry[1] < oldest_stamp:
+                oldest = key
+                oldest_stamp = entry[1]
+        if oldest is not None:
+            del self._glyphs[oldest]
+
+    def _renumber(self):
+        """Compact LRU stamps so they stay small ints."""
+        entries = sorted(self._glyphs.values(), key=lambda e: e[1])
+        for i, entry in enumerate(entries):
+            entry[1] = i
+        self._stamp = len(entries)
+
+    def _render(self, char, rotate, color, background):
+        """Render and rotate one glyph with the built-in 8x8 font."""
+        src = bytearray(self.GLYPH_BYTES)
+        fsrc = FrameBuffer(src, 8, 8, RGB565)
+        if background != 0:
+            # Swap background color bytes to correct for framebuf endianness
+            fsrc.fill(((background & 0xFF) << 8) | ((background & 0xFF00) >> 8))
+        # Swap text color bytes to correct for framebuf endianness
+        fsrc.text(char, 0, 0, ((color & 0xFF) << 8) | ((color & 0xFF00) >> 8))
+        if rotate == 0:
+            return src
+        dst = bytearray(self.GLYPH_BYTES)
+        fdst = FrameBuffer(dst, 8, 8, RGB565)
+        for y1 in range(8):
+            for x1 in range(8):
+                if rotate == 90:
+                    fdst.pixel(y1, x1, fsrc.pixel(x1, 7 - y1))
+                elif rotate == 180:
+                    fdst.pixel(x1, y1, fsrc.pixel(7 - x1, 7 - y1))
+                else:
+                    fdst.pixel(y1, x1, fsrc.pixel(7 - x1, y1))
+        return dst
+
+
+class StripBuffer(object):
+    """Preallocated full-width strip for filling and streaming areas.
+
+    Note:  The strip is sized once from free RAM and never reallocated, so
+    large fills and image loads use a fixed amount of memory.  Solid fills
+    paint it once per color and resend it.  SPI.write blocks until the
+    transfer is done and the port has no non-blocking or DMA write, so a
+    second strip could not be filled while the first is sent: streamed
+    data reuses this one.
+    """
+
+    def __init__(self, width, height, max_bytes, ram_fraction):
+        """Initialize strip buffer.
+
+        Args:
+            width (int): Display width in pixels (one strip row).
+            height (int): Display height (most rows the strip needs).
+            max_bytes (int): Upper bound on the size of the strip.
+            ram_fraction (int): The strip uses at most 1/ram_fraction of
+                the RAM free at startup.
+        """
+        row = width * 2
+        budget = max_bytes
+        if hasattr(gc, 'mem_free'):
+            gc.collect()
+            budget = min(budget, gc.mem_free() // ram_fraction)
+        self.rows = max(1, min(height, budget // row))
+        self.pixels = self.rows * width
+        self.buf = bytearray(self.pixels * 2)
+        self.view = memoryview(self.buf)
+        self.fbuf = FrameBuffer(self.buf, self.pixels, 1, RGB565)
+        self.fill_color = None  # Color the strip currently holds, if solid
+
+    def solid(self, color):
+        """Return view of the strip filled with color (big endian RGB565)."""
+        if color != self.fill_color:
+            # Swap color bytes to correct for framebuf endianness
+            self.fbuf.fill(((color & 0xFF) << 8) | ((color & 0xFF00) >> 8))
+            self.fill_color = color
+        return self.view
+
+    def next(self):
+        """Return view of the strip for streamed data (overwrites a fill)."""
+        self.fill_color = None
+        return self.view
+
+
+class Region(object):
+    """Named display area; use as a context manager to route writes to it.
+
+    Note:  While a region is entered every Display.block is counted
+    against it.  Writes outside the region, or to a static region after
+    RegionManager.freeze(), fail an assert: a layout bug found while
+    developing, with no cost once asserts are compiled out
+    (micropython.opt_level(1) or mpy-cross -O1).
+    """
+
+    def __init__(self, manager, name, x, y, w, h, static=False):
+        """Initialize region.
+
+        Args:
+            manager (RegionManager): Owner of the region.
+            name (string): Region name.
+            x, y (int): Top left corner.
+            w, h (int): Width and height.
+            static (Optional bool): True for content drawn once (default
+                False).
+        """
+        self.manager = manager
+        self.name = name
+        self.x0 = x
+        self.y0 = y
+        self.x1 = x + w - 1
+        self.y1 = y + h - 1
+        self.static = static
+        self.writes = 0
+        self.nbytes = 0
+        self._prev = None
+
+    def account(self, x0, y0, x1, y1, data):
+        """Count one block write routed to this region (checked by assert)."""
+        assert not (self.static and self.manager.frozen), \
+            'Region {0} is static.'.format(self.name)
+        assert self.x0 <= x0 and self.y0 <= y0 and x1 <= self.x1 and y1 <= self.y1, \
+            'Write ({0}, {1}, {2}, {3}) outside region {4}.'.format(
+                x0, y0, x1, y1, self.name)
+        self.writes += 1
+        self.nbytes += len(data)
+
+    def __enter__(self):
+        self._prev = self.manager.active
+        self.manager.active = self
+        return self
+
+    def __exit__(self, *exc):
+        self.manager.active = self._prev
+        self._prev = None
+
+
+PARTIAL_MIN_ROWS = 32  # Hidden rows that make partial mode worth it
+
+
+class RegionManager(object):
+    """Static and dynamic areas of a display.
+
+    Note:  Once the static content is drawn, freeze() turns on partial
+    mode when at least PARTIAL_MIN_ROWS whole rows are outside every
+    region, so the panel stops scanning rows that can only ever be blank
+    (PTLAR allows one hidden band, at the edges or wrapped around an
+    interior gap).  A thinner band saves next to nothing, while the
+    non-display area follows the B6h (PT) defaults, which can leave
+    visible lines on normally white panels, so it stays in normal mode.
+    Vertical
+    scrolling only helps content that moves as a whole, so it is left to
+    the caller.
+    """
+
+    def __init__(self, display):
+        """Initialize region manager.
+
+        Args:
+            display (Display): Display the regions belong to.
+        """
+        self.display = display
+        self.regions = {}
+        self.active = None
+        self.frozen = False
+        self.partial = None  # (start, end) rows while partial mode is on
+
+    def __getitem__(self, name):
+        return self.regions[name]
+
+    def add(self, name, x, y, w, h, static=False):
+        """Declare a region (clipped to the display).
+
+        Args:
+            name (string): Region name.
+            x, y (int): Top left corner.
+            w, h (int): Width and height.
+            static (Optional bool): True for content drawn once.
+        Returns:
+            Region: The new region.
+        """
+        d = self.display
+        x1 = min(x + w, d.width)
+        y1 = min(y + h, d.height)
+        x = max(x, 0)
+        y = max(y, 0)
+        region = Region(self, name, x, y, x1 - x, y1 - y, static)
+        self.regions[name] = region
+        return region
+
+    def reset(self):
+        """Drop all regions and return the panel to normal mode."""
+        self.regions = {}
+        self.active = None
+        self.frozen = False
+        if self.partial is not None:
+            self.display.write_cmd(self.display.NORON)
+            self.partial = None
+
+    def freeze(self, partial=True):
+        """Lock static regions and pick the scan mode.
+
+        Args:
+            partial (Optional bool): Allow partial mode (default True).
+        """
+        self.frozen = True
+        rows = self.partial_rows() if partial else None
+        if rows == self.partial:
+            return
+        d = self.display
+        if rows is None:
+            d.write_cmd(d.NORON)
+        else:
+            start, end = rows
+            d.write_cmd(d.PTLAR, start >> 8, start & 0xFF, end >> 8, end & 0xFF)
+            d.write_cmd(d.PTLON)
+        self.partial = rows
+
+    def partial_rows(self):
+        """Return PTLAR (start, end) frame memory rows, or None.
+
+        Returns None when fewer than PARTIAL_MIN_ROWS rows could be hidden.
+
+        Note:  start > end means the displayed area wraps and the hidden
+        band is end + 1 to start - 1.
+        """
+        d = self.display
+        if not self.regions or d.rotation & 0x20:  # MV: rows are columns
+            return None
+        spans = sorted((r.y0, r.y1) for r in self.regions.values())
+        merged = [list(spans[0])]
+        for y0, y1 in spans[1:]:
+            if y0 <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], y1)
+            else:
+                merged.append([y0, y1])
+        h = d.height
+        # Hide the edges ...
+        hidden = merged[0][0] + h - 1 - merged[-1][1]
+        start, end = merged[0][0], merged[-1][1]
+        # ... or the widest interior gap
+        for a, b in zip(merged, merged[1:]):
+            gap = b[0] - a[1] - 1
+            if gap > hidden:
+                hidden = gap
+                start, end = b[0], a[1]
+        if hidden < PARTIAL_MIN_ROWS:
+            return None
+        if d.rotation & 0x80:  # MY: frame memory rows run bottom up
+            start, end = h - 1 - end, h - 1 - start
+        return start, end
+
+    def stats(self):
+        """Return {name: (writes, bytes)} for every region."""
+        return dict((name, (r.writes, r.nbytes))
+                    for name, r in self.regions.items())
+
+
 class Display(object):
     """Serial interface for 16-bit color (5-6-5 RGB) IL9341 display.
 
@@ -93,6 +406,12 @@ class Display(object):
         (True, 270): 0xA0  # 1010 0000
     }
 
+    SCRATCH_PIXELS = const(1024)  # Pixels in the shared window scratch buffer
+    MAX_CMD_ARGS = const(16)  # Size of the preallocated command argument buffer
+    GLYPH_CACHE_SIZE = const(24)  # Glyphs kept by draw_text8x8
+    STRIP_MAX_BYTES = const(9600)  # Largest strip buffer (20 rows at 240)
+    STRIP_RAM_FRACTION = const(8)  # Strip uses at most 1/8 of free RAM
+
     def __init__(self, spi, cs, dc, rst, width=240, height=320, rotation=0,
                  mirror=False, bgr=True, gamma=True, x_offset=0, y_offset=0):
         """Initialize OLED.
@@ -127,6 +446,25 @@ class Display(object):
         self.offset = bool(x_offset or y_offset)
         self.x_offset = x_offset
         self.y_offset = y_offset
+        # Scratch buffer for windowed drawing (allocated on first use)
+        self._scratch = None
+        # Preallocated command, argument and pixel buffers so that block,
+        # scroll and set_scroll never allocate on the heap
+        self._cmd_buf = bytearray(1)
+        self._arg_buf = bytearray(self.MAX_CMD_ARGS)
+        arg_mv = memoryview(self._arg_buf)
+        self._arg_views = [arg_mv[:n] for n in range(self.MAX_CMD_ARGS + 1)]
+        self._pixel_buf = bytearray(2)
+        # Pre-rendered glyphs for draw_text8x8
+        self.glyphs = GlyphCache(self.GLYPH_CACHE_SIZE)
+        # Fill/stream strips, sized from free RAM before anything else
+        self.strips = StripBuffer(max(width, height), max(width, height),
+                                  self.STRIP_MAX_BYTES,
+                                  self.STRIP_RAM_FRACTION)
+        # Static/dynamic areas; block() checks writes against the active one
+        self.regions = RegionManager(self)
+        # Last column/page window sent to the controller (-1 = unknown)
+        self.invalidate_window()
 
         # Initialize GPIO pins and set implementation specific methods
         if implementation.name == 'circuitpython':
@@ -135,14 +473,18 @@ class Display(object):
             self.rst.switch_to_output(value=True)
             self.reset = self.reset_cpy
             self.write_cmd = self.write_cmd_cpy
+            self.write_cmd_view = self.write_cmd_view_cpy
             self.write_data = self.write_data_cpy
+            self.write_window = self.write_window_cpy
         else:
             self.cs.init(self.cs.OUT, value=1)
             self.dc.init(self.dc.OUT, value=0)
             self.rst.init(self.rst.OUT, value=1)
             self.reset = self.reset_mpy
             self.write_cmd = self.write_cmd_mpy
+            self.write_cmd_view = self.write_cmd_view_mpy
             self.write_data = self.write_data_mpy
+            self.write_window = self.write_window_mpy
         self.reset()
         # Send initialization commands
         self.write_cmd(self.SWRESET)  # Software reset
@@ -187,18 +529,38 @@ class Display(object):
             y1 (int):  Ending Y position.
             data (bytes): Data buffer to write.
         """
+        region = self.regions.active
+        if region is not None:
+            region.account(x0, y0, x1, y1, data)
         if self.offset:  # Add offset if specified
             x0 += self.x_offset
             x1 += self.x_offset
             y0 += self.y_offset
             y1 += self.y_offset
 
-        self.write_cmd(self.SET_COLUMN,
-                       x0 >> 8, x0 & 0xff, x1 >> 8, x1 & 0xff)
-        self.write_cmd(self.SET_PAGE,
-                       y0 >> 8, y0 & 0xff, y1 >> 8, y1 & 0xff)
-        self.write_cmd(self.WRITE_RAM)
-        self.write_data(data)
+        self.write_window(x0, y0, x1, y1, data)
+
+    def cmd_args(self, n):
+        """Return preallocated view of the first n command argument bytes.
+
+        Args:
+            n (int): Number of argument bytes (0 to MAX_CMD_ARGS).
+        Returns:
+            memoryview: Writable view to fill and pass to write_cmd_view.
+        """
+        return self._arg_views[n]
+
+    def invalidate_window(self):
+        """Forget the cached column/page window.
+
+        Note:
+            Call after anything outside block() changes the controller
+            address window (reset, raw SET_COLUMN/SET_PAGE writes).
+        """
+        self._win_x0 = -1
+        self._win_x1 = -1
+        self._win_y0 = -1
+        self._win_y1 = -1
 
     def cleanup(self):
         """Clean up resources."""
@@ -212,26 +574,12 @@ class Display(object):
 
         Args:
             color (Optional int): RGB565 color value (Default: 0 = Black).
-            hlines (Optional int): # of horizontal lines per chunk (Default: 8)
+            hlines (Optional int): Ignored, kept for compatibility.
         Note:
-            hlines was introduced to deal with memory allocation on some
-            boards.  Smaller values allocate less memory but take longer
-            to execute.  hlines must be a factor of the display height.
-            For example, for a 240 pixel height, valid values for hline
-            would be 1, 2, 3, 4, 5, 6, 8, 10, 12, 15, 16, 20, 24, 30, 40, etc.
-            Higher values may result in memory allocation errors.
+            The screen is written in strips of the preallocated strip
+            buffer, whose height is chosen from free RAM at startup.
         """
-        w = self.width
-        h = self.height
-        assert hlines > 0 and h % hlines == 0, (
-            "hlines must be a non-zero factor of height.")
-        # Clear display
-        if color:
-            line = color.to_bytes(2, 'big') * (w * hlines)
-        else:
-            line = bytearray(w * 2 * hlines)
-        for y in range(0, h, hlines):
-            self.block(0, y, w - 1, y + hlines - 1, line)
+        self.fill_window(0, 0, self.width, self.height, color)
 
     def display_off(self):
         """Turn display off."""
@@ -346,8 +694,7 @@ class Display(object):
         """
         if self.is_off_grid(x, y, x + w - 1, y):
             return
-        line = color.to_bytes(2, 'big') * w
-        self.block(x, y, x + w - 1, y, line)
+        self.fill_window(x, y, w, 1, color)
 
     def draw_image(self, path, x=0, y=0, w=320, h=240):
         """Draw image from flash.
@@ -358,28 +705,24 @@ class Display(object):
             y (int): Y coordinate of image top.  Default is 0.
             w (int): Width of image.  Default is 320.
             h (int): Height of image.  Default is 240.
+        Note:
+            Rows are read straight into the strip buffer, so no chunk is
+            allocated while the image streams in.
         """
         x2 = x + w - 1
         y2 = y + h - 1
         if self.is_off_grid(x, y, x2, y2):
             return
+        strips = self.strips
+        chunk_height = strips.pixels // w
         with open(path, "rb") as f:
-            chunk_height = 1024 // w
-            chunk_count, remainder = divmod(h, chunk_height)
-            chunk_size = chunk_height * w * 2
             chunk_y = y
-            if chunk_count:
-                for c in range(0, chunk_count):
-                    buf = f.read(chunk_size)
-                    self.block(x, chunk_y,
-                               x2, chunk_y + chunk_height - 1,
-                               buf)
-                    chunk_y += chunk_height
-            if remainder:
-                buf = f.read(remainder * w * 2)
-                self.block(x, chunk_y,
-                           x2, chunk_y + remainder - 1,
-                           buf)
+            while chunk_y <= y2:
+                rows = min(chunk_height, y2 - chunk_y + 1)
+                buf = strips.next()[:rows * w * 2]
+                f.readinto(buf)
+                self.block(x, chunk_y, x2, chunk_y + rows - 1, buf)
+                chunk_y += rows
 
     def draw_letter(self, x, y, letter, font, color, background=0,
                     landscape=False, rotate_180=False):
@@ -436,6 +779,10 @@ class Display(object):
             x1, y1 (int): Starting coordinates of the line
             x2, y2 (int): Ending coordinates of the line
             color (int): RGB565 color value.
+        Note:
+            Pixels are emitted in runs: every horizontal (or vertical for
+            steep lines) run of the Bresenham walk is a single block write
+            instead of one block per pixel.
         """
         # Check for horizontal line
         if y1 == y2:
@@ -473,17 +820,120 @@ class Display(object):
         error = dx >> 1
         ystep = 1 if y1 < y2 else -1
         y = y1
+        ady = abs(dy)
+        pixel = color.to_bytes(2, 'big')
+        run_start = x1
         for x in range(x1, x2 + 1):
-            # Had to reverse HW ????
-            if not is_steep:
-                self.draw_pixel(x, y, color)
-            else:
-                self.draw_pixel(y, x, color)
-            error -= abs(dy)
+            error -= ady
+            # Flush run when y is about to change or the line ends
+            if error < 0 or x == x2:
+                n = x - run_start + 1
+                # Had to reverse HW ????
+                if not is_steep:
+                    self.block(run_start, y, x, y, pixel * n)
+                else:
+                    self.block(y, run_start, y, x, pixel * n)
+                run_start = x + 1
             if error < 0:
                 y += ystep
                 error += dx
 
+    def draw_lines_batch(self, segments, color, background=None):
+        """Draw many line segments at once.
+
+        Args:
+            segments ([int, ...]): Flat x1, y1, x2, y2 sequence per segment
+                (list, tuple or array('h')).
+            color (int): RGB565 color value.
+            background (Optional int): RGB565 color of the area under the
+                segments.  When given, segments are rasterized into small
+                windows of a scratch buffer and each window is sent with
+                one block write.
+        Note:
+            With background set, every pixel of a window that is not on a
+            segment is painted background, so the bounding box of each
+            segment must contain nothing else worth keeping.  Lines are
+            rasterized with FrameBuffer.line in this mode.
+        """
+        n = len(segments) - len(segments) % 4
+        if background is None:
+            for i in range(0, n, 4):
+                self.draw_line(segments[i], segments[i + 1],
+                               segments[i + 2], segments[i + 3], color)
+            return
+        for i in range(0, n, 4):
+            x1 = segments[i]
+            y1 = segments[i + 1]
+            x2 = segments[i + 2]
+            y2 = segments[i + 3]
+            if self.is_off_grid(min(x1, x2), min(y1, y2),
+                                max(x1, x2), max(y1, y2)):
+                continue
+            for box in self._line_windows(x1, y1, x2, y2):
+                self._draw_lines_window(box, segments, n, color, background)
+
+    def _line_windows(self, x1, y1, x2, y2):
+        """Split a segment into windows that fit the scratch buffer.
+
+        Returns:
+            list: Inclusive (x0, y0, x1, y1) boxes covering all line pixels.
+        """
+        is_steep = abs(y2 - y1) > abs(x2 - x1)
+        if is_steep:
+            x1, y1 = y1, x1
+            x2, y2 = y2, x2
+        if x1 > x2:
+            x1, x2 = x2, x1
+            y1, y2 = y2, y1
+        major = x2 - x1
+        ylo = min(y1, y2)
+        yhi = max(y1, y2)
+        # Use the fewest pieces whose windows all fit the scratch buffer
+        for k in range(1, major + 2):
+            boxes = []
+            for p in range(k):
+                a = x1 + (major + 1) * p // k
+                b = x1 + (major + 1) * (p + 1) // k - 1
+                if major:
+                    ya = y1 + (y2 - y1) * (a - x1) // major
+                    yb = y1 + (y2 - y1) * (b - x1) // major
+                else:
+                    ya = yb = y1
+                lo = max(min(ya, yb) - 1, ylo)
+                hi = min(max(ya, yb) + 1, yhi)
+                if (b - a + 1) * (hi - lo + 1) > self.SCRATCH_PIXELS:
+                    break
+                if is_steep:
+                    boxes.append((lo, a, hi, b))
+                else:
+                    boxes.append((a, lo, b, hi))
+            else:
+                return boxes
+        return boxes
+
+    def _draw_lines_window(self, box, segments, n, color, background):
+        """Rasterize every segment touching box into scratch and send it."""
+        x0, y0, x1, y1 = box
+        w = x1 - x0 + 1
+        h = y1 - y0 + 1
+        if self._scratch is None:
+            self._scratch = bytearray(self.SCRATCH_PIXELS * 2)
+        mv = memoryview(self._scratch)
+        fbuf = FrameBuffer(mv, w, h, RGB565)
+        # Swap color bytes to correct for framebuf endianness
+        fbuf.fill(((background & 0xFF) << 8) | ((background & 0xFF00) >> 8))
+        t_color = ((color & 0xFF) << 8) | ((color & 0xFF00) >> 8)
+        for i in range(0, n, 4):
+            sx1 = segments[i]
+            sy1 = segments[i + 1]
+            sx2 = segments[i + 2]
+            sy2 = segments[i + 3]
+            if (max(sx1, sx2) < x0 or min(sx1, sx2) > x1 or
+                    max(sy1, sy2) < y0 or min(sy1, sy2) > y1):
+                continue
+            fbuf.line(sx1 - x0, sy1 - y0, sx2 - x0, sy2 - y0, t_color)
+        self.block(x0, y0, x1, y1, mv[:w * h * 2])
+
     def draw_lines(self, coords, color):
         """Draw multiple lines.
 
@@ -509,7 +959,10 @@ class Display(object):
         """
         if self.is_off_grid(x, y, x, y):
             return
-        self.block(x, y, x, y, color.to_bytes(2, 'big'))
+        pixel = self._pixel_buf
+        pixel[0] = color >> 8
+        pixel[1] = color & 0xFF
+        self.block(x, y, x, y, pixel)
 
     def draw_polygon(self, sides, x0, y0, r, color, rotate=0):
         """Draw an n-sided regular polygon.
@@ -623,47 +1076,43 @@ class Display(object):
             color (int): RGB565 color value.
             background (int): RGB565 background color (default: black).
             rotate(int): 0, 90, 180, 270
+        Note:
+            Glyphs come from the glyph cache already rotated, so a string
+            is composed by copying 128 byte glyphs into the scratch buffer
+            and sent with one block write.
         """
-        w = len(text) * 8
+        n = len(text)
+        w = n * 8
         h = 8
         # Confirm coordinates in boundary
         if self.is_off_grid(x, y, x + 7, y + 7):
             return
-        buf = bytearray(w * 16)
-        fbuf = FrameBuffer(buf, w, h, RGB565)
-        if background != 0:
-            # Swap background color bytes to correct for framebuf endianness
-            b_color = ((background & 0xFF) << 8) | ((background & 0xFF00) >> 8)
-            fbuf.fill(b_color)
-        # Swap text color bytes to correct for framebuf endianness
-        t_color = ((color & 0xFF) << 8) | ((color & 0xFF00) >> 8)
-        fbuf.text(text, 0, 0, t_color)
-        if rotate == 0:
+        if rotate not in (0, 90, 180, 270):
+            return
+        size = n * GlyphCache.GLYPH_BYTES
+        if size <= self.SCRATCH_PIXELS * 2:
+            if self._scratch is None:
+                self._scratch = bytearray(self.SCRATCH_PIXELS * 2)
+            buf = memoryview(self._scratch)[:size]
+        else:
+            buf = memoryview(bytearray(size))
+        glyphs = self.glyphs
+        for i in range(n):
+            # 180 and 270 read the string backwards
+            c = text[i] if rotate < 180 else text[n - 1 - i]
+            glyph = glyphs.get(c, rotate, color, background)
+            if rotate == 90 or rotate == 270:
+                # Glyphs stack vertically: each one is a contiguous block
+                buf[i * 128:(i + 1) * 128] = glyph
+            else:
+                # Glyphs sit side by side: copy one 16 byte row at a time
+                for row in range(8):
+                    d = (row * w + i * 8) * 2
+                    buf[d:d + 16] = glyph[row * 16:(row + 1) * 16]
+        if rotate == 90 or rotate == 270:
+            self.block(x, y, x + (h - 1), y + w - 1, buf)
+        else:
             self.block(x, y, x + w - 1, y + (h - 1), buf)
-        elif rotate == 90:
-            buf2 = bytearray(w * 16)
-            fbuf2 = FrameBuffer(buf2, h, w, RGB565)
-            for y1 in range(h):
-                for x1 in range(w):
-                    fbuf2.pixel(y1, x1,
-                                fbuf.pixel(x1, (h - 1) - y1))
-            self.block(x, y, x + (h - 1), y + w - 1, buf2)
-        elif rotate == 180:
-            buf2 = bytearray(w * 16)
-            fbuf2 = FrameBuffer(buf2, w, h, RGB565)
-            for y1 in range(h):
-                for x1 in range(w):
-                    fbuf2.pixel(x1, y1,
-                                fbuf.pixel((w - 1) - x1, (h - 1) - y1))
-            self.block(x, y, x + w - 1, y + (h - 1), buf2)
-        elif rotate == 270:
-            buf2 = bytearray(w * 16)
-            fbuf2 = FrameBuffer(buf2, h, w, RGB565)
-            for y1 in range(h):
-                for x1 in range(w):
-                    fbuf2.pixel(y1, x1,
-                                fbuf.pixel((w - 1) - x1, y1))
-            self.block(x, y, x + (h - 1), y + w - 1, buf2)
 
     def draw_vline(self, x, y, h, color):
         """Draw a vertical line.
@@ -677,8 +1126,7 @@ class Display(object):
         # Confirm coordinates in boundary
         if self.is_off_grid(x, y, x, y + h - 1):
             return
-        line = color.to_bytes(2, 'big') * h
-        self.block(x, y, x, y + h - 1, line)
+        self.fill_window(x, y, 1, h, color)
 
     def fill_circle(self, x0, y0, r, color):
         """Draw a filled circle.
@@ -772,23 +1220,7 @@ class Display(object):
         """
         if self.is_off_grid(x, y, x + w - 1, y + h - 1):
             return
-        chunk_height = 1024 // w
-        chunk_count, remainder = divmod(h, chunk_height)
-        chunk_size = chunk_height * w
-        chunk_y = y
-        if chunk_count:
-            buf = color.to_bytes(2, 'big') * chunk_size
-            for c in range(0, chunk_count):
-                self.block(x, chunk_y,
-                           x + w - 1, chunk_y + chunk_height - 1,
-                           buf)
-                chunk_y += chunk_height
-
-        if remainder:
-            buf = color.to_bytes(2, 'big') * remainder * w
-            self.block(x, chunk_y,
-                       x + w - 1, chunk_y + remainder - 1,
-                       buf)
+        self.fill_window(x, y, w, h, color)
 
     def fill_rectangle(self, x, y, w, h, color):
         """Draw a filled rectangle.
@@ -901,23 +1333,31 @@ class Display(object):
         """
         if self.is_off_grid(x, y, x + w - 1, y + h - 1):
             return
-        chunk_width = 1024 // h
-        chunk_count, remainder = divmod(w, chunk_width)
-        chunk_size = chunk_width * h
-        chunk_x = x
-        if chunk_count:
-            buf = color.to_bytes(2, 'big') * chunk_size
-            for c in range(0, chunk_count):
-                self.block(chunk_x, y,
-                           chunk_x + chunk_width - 1, y + h - 1,
-                           buf)
-                chunk_x += chunk_width
-
-        if remainder:
-            buf = color.to_bytes(2, 'big') * remainder * h
-            self.block(chunk_x, y,
-                       chunk_x + remainder - 1, y + h - 1,
-                       buf)
+        self.fill_window(x, y, w, h, color)
+
+    def fill_window(self, x, y, w, h, color):
+        """Fill a window with a solid color in strips (no bounds check).
+
+        Args:
+            x (int): Starting X position.
+            y (int): Starting Y position.
+            w (int): Width of window.
+            h (int): Height of window.
+            color (int): RGB565 color value.
+        Note:
+            The strip is painted once per color and resent for each band
+            of rows; only the band views are created, never pixel data.
+        """
+        buf = self.strips.solid(color)
+        chunk_height = min(h, self.strips.pixels // w)
+        chunk = buf[:chunk_height * w * 2]
+        x2 = x + w - 1
+        y2 = y + h - 1
+        while y + chunk_height - 1 <= y2:
+            self.block(x, y, x2, y + chunk_height - 1, chunk)
+            y += chunk_height
+        if y <= y2:
+            self.block(x, y, x2, y2, buf[:(y2 - y + 1) * w * 2])
 
     def invert(self, enable=True):
         """Enables or disables inversion of display colors.
@@ -976,6 +1416,7 @@ class Display(object):
 
         Notes: CircuitPython implemntation
         """
+        self.invalidate_window()
         self.rst.value = False
         sleep(.05)
         self.rst.value = True
@@ -986,6 +1427,7 @@ class Display(object):
 
         Notes: MicroPython implemntation
         """
+        self.invalidate_window()
         self.rst(0)
         sleep(.05)
         self.rst(1)
@@ -997,7 +1439,10 @@ class Display(object):
         Args:
             y (int): Number of pixels to scroll display.
         """
-        self.write_cmd(self.VSCRSADD, y >> 8, y & 0xFF)
+        args = self._arg_buf
+        args[0] = y >> 8
+        args[1] = y & 0xFF
+        self.write_cmd_view(self.VSCRSADD, self._arg_views[2])
 
     def set_scroll(self, top, bottom):
         """Set the height of the top and bottom scroll margins.
@@ -1008,13 +1453,14 @@ class Display(object):
         """
         if top + bottom <= self.height:
             middle = self.height - (top + bottom)
-            self.write_cmd(self.VSCRDEF,
-                           top >> 8,
-                           top & 0xFF,
-                           middle >> 8,
-                           middle & 0xFF,
-                           bottom >> 8,
-                           bottom & 0xFF)
+            args = self._arg_buf
+            args[0] = top >> 8
+            args[1] = top & 0xFF
+            args[2] = middle >> 8
+            args[3] = middle & 0xFF
+            args[4] = bottom >> 8
+            args[5] = bottom & 0xFF
+            self.write_cmd_view(self.VSCRDEF, self._arg_views[6])
 
     def sleep(self, enable=True):
         """Enters or exits sleep mode.
@@ -1034,13 +1480,35 @@ class Display(object):
             command (byte): ILI9341 command code.
             *args (optional bytes): Data to transmit.
         """
+        n = len(args)
+        if n > self.MAX_CMD_ARGS:
+            self.write_cmd_view(command, bytearray(args))
+            return
+        buf = self._arg_buf
+        for i in range(n):
+            buf[i] = args[i]
+        self.write_cmd_view(command, self._arg_views[n])
+
+    def write_cmd_view_mpy(self, command, data=None):
+        """Write command with a prepared argument buffer (MicroPython).
+
+        Args:
+            command (byte): ILI9341 command code.
+            data (optional buffer): Argument bytes, e.g. from cmd_args().
+        Note:
+            Performs no heap allocation.
+        """
+        if (command == self.SET_COLUMN or command == self.SET_PAGE or
+                command == self.SWRESET):
+            self.invalidate_window()
+        self._cmd_buf[0] = command
         self.dc(0)
         self.cs(0)
-        self.spi.write(bytearray([command]))
+        self.spi.write(self._cmd_buf)
         self.cs(1)
         # Handle any passed data
-        if len(args) > 0:
-            self.write_data(bytearray(args))
+        if data is not None and len(data) > 0:
+            self.write_data(data)
 
     def write_cmd_cpy(self, command, *args):
         """Write command to OLED (CircuitPython).
@@ -1061,6 +1529,98 @@ class Display(object):
         if len(args) > 0:
             self.write_data(bytearray(args))
 
+    def write_cmd_view_cpy(self, command, data=None):
+        """Write command with a prepared argument buffer (CircuitPython).
+
+        Args:
+            command (byte): ILI9341 command code.
+            data (optional buffer): Argument bytes, e.g. from cmd_args().
+        """
+        self._cmd_buf[0] = command
+        self.dc.value = False
+        self.cs.value = False
+        # Confirm SPI locked before writing
+        while not self.spi.try_lock():
+            pass
+        self.spi.write(self._cmd_buf)
+        self.spi.unlock()
+        self.cs.value = True
+        # Handle any passed data
+        if data is not None and len(data) > 0:
+            self.write_data(data)
+
+    def write_window_mpy(self, x0, y0, x1, y1, data):
+        """Write pixel data to a window in one CS assertion (MicroPython).
+
+        Args:
+            x0, y0 (int): Starting position (offset already applied).
+            x1, y1 (int): Ending position (offset already applied).
+            data (bytes): Pixel data to write.
+        Note:
+            CS stays low for the whole sequence and only DC toggles.
+            SET_COLUMN and SET_PAGE are skipped when they match the
+            previous window; WRITE_RAM always restarts at its top left.
+        """
+        spi = self.spi
+        dc = self.dc
+        cmd = self._cmd_buf
+        args = self._arg_buf
+        window = self._arg_views[4]
+        self.cs(0)
+        if x0 != self._win_x0 or x1 != self._win_x1:
+            cmd[0] = self.SET_COLUMN
+            dc(0)
+            spi.write(cmd)
+            args[0] = x0 >> 8
+            args[1] = x0 & 0xff
+            args[2] = x1 >> 8
+            args[3] = x1 & 0xff
+            dc(1)
+            spi.write(window)
+            self._win_x0 = x0
+            self._win_x1 = x1
+        if y0 != self._win_y0 or y1 != self._win_y1:
+            cmd[0] = self.SET_PAGE
+            dc(0)
+            spi.write(cmd)
+            args[0] = y0 >> 8
+            args[1] = y0 & 0xff
+            args[2] = y1 >> 8
+            args[3] = y1 & 0xff
+            dc(1)
+            spi.write(window)
+            self._win_y0 = y0
+            self._win_y1 = y1
+        cmd[0] = self.WRITE_RAM
+        dc(0)
+        spi.write(cmd)
+        dc(1)
+        spi.write(data)
+        self.cs(1)
+
+    def write_window_cpy(self, x0, y0, x1, y1, data):
+        """Write pixel data to a window (CircuitPython).
+
+        Args:
+            x0, y0 (int): Starting position (offset already applied).
+            x1, y1 (int): Ending position (offset already applied).
+            data (bytes): Pixel data to write.
+        """
+        args = self._arg_buf
+        window = self._arg_views[4]
+        args[0] = x0 >> 8
+        args[1] = x0 & 0xff
+        args[2] = x1 >> 8
+        args[3] = x1 & 0xff
+        self.write_cmd_view(self.SET_COLUMN, window)
+        args[0] = y0 >> 8
+        args[1] = y0 & 0xff
+        args[2] = y1 >> 8
+        args[3] = y1 & 0xff
+        self.write_cmd_view(self.SET_PAGE, window)
+        self.write_cmd_view(self.WRITE_RAM)
+        self.write_data(data)
+
     def write_data_mpy(self, data):
         """Write data to OLED (MicroPython).
 
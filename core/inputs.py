@@ -0,0 +1,176 @@
+"""Debounced buttons from edge interrupts and GPIO input register reads.
+
+Every button gets a hard IRQ on both edges.  The handler only stores the
+button index, level and ticks_ms() in preallocated arrays (a ring buffer)
+and schedules a drain with micropython.schedule, so no edge is lost while
+the main loop is stuck in a slow frame.  poll() drains what is left,
+debounces in integer milliseconds and reconciles with one read of each
+GPIO input register in use, which also settles a release whose bounce was
+swallowed by the debounce window.
+"""
+import sys
+import time
+from array import array
+
+import micropython  # type: ignore
+from machine import Pin  # type: ignore
+
+try:
+    from machine import mem32  # type: ignore
+except ImportError:
+    mem32 = None
+
+RING_SIZE = 32  # Edges buffered between drains (power of two)
+DEBOUNCE_MS = 8  # Edges closer than this to the last accepted change bounce
+
+# ESP32 GPIO input registers: GPIO0-31 and GPIO32-39.  GPIO28-31 do not
+# exist and IN1 has 8 valid bits, so neither read exceeds a small int.
+GPIO_IN_REG = 0x3FF4403C
+GPIO_IN1_REG = 0x3FF44040
+
+
+class Inputs(object):
+    """Active-low buttons reported as bitmasks (bit i is pins[i]).
+
+    Note:  After poll(), state has a bit set for each button held down,
+    pressed and released the buttons that went down or up since the
+    previous poll, and presses[i] how many times button i went down (taps
+    faster than the poll rate are counted, not merged).
+    """
+
+    def __init__(self, pins, debounce_ms=DEBOUNCE_MS):
+        """Initialize inputs.
+
+        Args:
+            pins (sequence of int): GPIO numbers; index i becomes bit i.
+            debounce_ms (Optional int): Debounce window (default
+                DEBOUNCE_MS).
+        """
+        n = len(pins)
+        self.n = n
+        self.debounce_ms = debounce_ms
+        self.pins = [Pin(p, Pin.IN, Pin.PULL_UP) for p in pins]
+        self._bit_of = dict((pin, i) for i, pin in enumerate(self.pins))
+        # (register, mask) per button for the register read
+        self._use_regs = mem32 is not None and sys.platform == 'esp32'
+        self._regs = [(GPIO_IN_REG, 1 << p) if p < 32 else
+                      (GPIO_IN1_REG, 1 << (p - 32)) for p in pins]
+        # Ring buffer written by the IRQ handler
+        self._times = array('i', [0] * RING_SIZE)
+        self._codes = array('B', [0] * RING_SIZE)  # index << 1 | level
+        self._head = 0
+        self._tail = 0
+        self.overruns = 0
+        self._scheduled = False
+        self._draining = False
+        self._drain_cb = self._drain_scheduled  # bound once: ISR must not allocate
+        # Debounced state and edges accumulated since the last poll
+        now = time.ticks_ms()
+        self.state = self.sample()
+        # Last accepted change (start out of the window) and last raw edge
+        self._changed = array('i', [time.ticks_add(now, -debounce_ms)] * n)
+        self._edge = array('i', self._changed)
+        self._pressed = 0
+        self._released = 0
+        self._presses = array('H', [0] * n)
+        self.pressed = 0
+        self.released = 0
+        self.presses = array('H', [0] * n)
+        for pin in self.pins:
+            pin.irq(handler=self._isr,
+                    trigger=Pin.IRQ_FALLING | Pin.IRQ_RISING, hard=True)
+
+    def _isr(self, pin):
+        head = self._head
+        nxt = (head + 1) & (RING_SIZE - 1)
+        if nxt == self._tail:
+            self.overruns += 1
+            return
+        self._times[head] = time.ticks_ms()
+        self._codes[head] = self._bit_of[pin] << 1 | pin.value()
+        self._head = nxt
+        if not self._scheduled:
+            self._scheduled = True
+            try:
+                micropython.schedule(self._drain_cb, None)
+            except RuntimeError:  # queue full: poll() drains instead
+                self._scheduled = False
+
+    def _drain_scheduled(self, _):
+        self._scheduled = False
+        self._drain()
+
+    def sample(self):
+        """Return the raw bitmask of buttons reading low right now."""
+        mask = 0
+        if self._use_regs:
+            lo = mem32[GPIO_IN_REG]
+            hi = mem32[GPIO_IN1_REG]
+            for i in range(self.n):
+                reg, bit = self._regs[i]
+                if not ((lo if reg == GPIO_IN_REG else hi) & bit):
+                    mask |= 1 << i
+        else:
+            for i in range(self.n):
+                if not self.pins[i].value():
+                    mask |= 1 << i
+        return mask
+
+    def _accept(self, i, down, t):
+        bit = 1 << i
+        self._changed[i] = t
+        if down:
+            self.state |= bit
+            self._pressed |= bit
+            self._presses[i] += 1
+        else:
+            self.state &= ~bit
+            self._released |= bit
+
+    def _drain(self):
+        if self._draining:
+            return
+        self._draining = True
+        tail = self._tail
+        while tail != self._head:
+            code = self._codes[tail]
+            t = self._times[tail]
+            tail = (tail + 1) & (RING_SIZE - 1)
+            i = code >> 1
+            down = not (code & 1)
+            self._edge[i] = t
+            if down != bool(self.state & (1 << i)) and \
+                    time.ticks_diff(t, self._changed[i]) >= self.debounce_ms:
+                self._accept(i, down, t)
+        self._tail = tail
+        self._draining = False
+
+    def poll(self, now=None):
+        """Debounce pending edges and publish state, pressed and released.
+
+        Args:
+            now (Optional int): Current ticks_ms (default: read the clock).
+        Returns:
+            int: Bitmask of buttons held down.
+        """
+        if now is None:
+            now = time.ticks_ms()
+        self._drain()
+        self._draining = True  # keep scheduled drains out of the snapshot
+        raw = self.sample()
+        for i in range(self.n):
+            down = bool(raw & (1 << i))
+            if down != bool(self.state & (1 << i)) and \
+                    time.ticks_diff(now, self._changed[i]) >= self.debounce_ms:
+                # The level settled at its last edge (or now if none was seen)
+                edge = self._edge[i]
+                self._accept(i, down, edge if time.ticks_diff(
+                    edge, self._changed[i]) > 0 else now)
+            self.presses[i] = self._presses[i]
+            self._presses[i] = 0
+        self.pressed = self._pressed
+        self.released = self._released
+        self._pressed = 0
+        self._released = 0
+        self._draining = False
+        return self.state
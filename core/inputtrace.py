@@ -0,0 +1,215 @@
+"""Recorded button traces for repeatable ESP32 runs.
+
+A trace holds the debounced button state over time, as Inputs.poll()
+reports it, so a drive recorded on the board can be replayed on the
+board or in the host simulator with a virtual clock.  Layout (little
+endian):
+
+    header  '<4sBB'  magic b'ITRC', version, buttons
+    record  '<HB' + buttons bytes:  ms since the previous record, held
+            bitmask, then the press count of each button
+
+A record is written only when the state changes or a button was pressed.
+Gaps longer than 65535 ms get filler records without presses.
+"""
+import struct
+import time
+
+MAGIC = b'ITRC'
+VERSION = 1
+HEADER = '<4sBB'
+HEADER_SIZE = struct.calcsize(HEADER)
+MAX_GAP_MS = 0xFFFF
+FLUSH_BYTES = 512  # RecordingInputs buffer written to flash when full
+
+
+def record_size(buttons):
+    """Return bytes per record for a trace of buttons."""
+    return 3 + buttons
+
+
+class TraceWriter(object):
+    """Append records to a trace stream."""
+
+    def __init__(self, stream, buttons):
+        """Initialize writer and write the header.
+
+        Args:
+            stream (stream): Binary file or buffer with write().
+            buttons (int): Number of buttons (bits) in each state.
+        """
+        self.stream = stream
+        self.buttons = buttons
+        self.last_ms = 0
+        self.records = 0
+        self._last_state = 0
+        self._rec = bytearray(record_size(buttons))
+        stream.write(struct.pack(HEADER, MAGIC, VERSION, buttons))
+
+    def add(self, t_ms, state, presses=None):
+        """Append state at t_ms (ms since the start of the trace).
+
+        Args:
+            t_ms (int): Time of the record; never earlier than the last.
+            state (int): Bitmask of buttons held.
+            presses (Optional sequence of int): Presses per button since
+                the previous record (default none).
+        """
+        dt = t_ms - self.last_ms
+        if dt < 0:
+            raise ValueError('Trace records must not go back in time.')
+        rec = self._rec
+        while dt > MAX_GAP_MS:
+            struct.pack_into('<HB', rec, 0, MAX_GAP_MS, self._last_state)
+            for i in range(self.buttons):
+                rec[3 + i] = 0
+            self.stream.write(rec)
+            self.records += 1
+            dt -= MAX_GAP_MS
+        struct.pack_into('<HB', rec, 0, dt, state)
+        for i in range(self.buttons):
+            rec[3 + i] = min(presses[i], 255) if presses else 0
+        self.stream.write(rec)
+        self.records += 1
+        self.last_ms = t_ms
+        self._last_state = state
+
+
+def read_trace(data):
+    """Return (buttons, [(t_ms, state, presses), ...]) from trace bytes.
+
+    Raises:
+        ValueError: If data is not a trace.
+    """
+    magic, version, buttons = struct.unpack_from(HEADER, data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Not a button trace.')
+    size = record_size(buttons)
+    records = []
+    t = 0
+    for pos in range(HEADER_SIZE, len(data) - size + 1, size):
+        dt, state = struct.unpack_from('<HB', data, pos)
+        t += dt
+        records.append((t, state, bytes(data[pos + 3:pos + size])))
+    return buttons, records
+
+
+class RecordingInputs(object):
+    """Inputs wrapper that writes what poll() reports to a trace file.
+
+    Note:  Records go to a preallocated buffer that is written out every
+    FLUSH_BYTES, so recording adds a flash write only every few dozen
+    changes.  Call close() to flush the tail.
+    """
+
+    def __init__(self, inputs, path):
+        """Initialize recorder.
+
+        Args:
+            inputs (Inputs): Live inputs being recorded.
+            path (string): Trace file to create.
+        """
+        self.inputs = inputs
+        self.n = inputs.n
+        self.f = open(path, 'wb')
+        self._buf = bytearray(FLUSH_BYTES)
+        self._mv = memoryview(self._buf)
+        self._used = 0
+        self.writer = TraceWriter(self, self.n)
+        self.start_ms = None
+        self.state = inputs.state
+        self.pressed = 0
+        self.released = 0
+        self.presses = inputs.presses
+
+    def write(self, data):
+        """Buffer record bytes (the TraceWriter stream interface)."""
+        n = len(data)
+        if self._used + n > FLUSH_BYTES:
+            self.flush()
+        self._mv[self._used:self._used + n] = data
+        self._used += n
+
+    def flush(self):
+        self.f.write(self._mv[:self._used])
+        self._used = 0
+
+    def close(self):
+        """Flush and close the trace file."""
+        self.flush()
+        self.f.close()
+
+    def poll(self, now):
+        """Poll the live inputs and record any change."""
+        inputs = self.inputs
+        prev = self.state
+        state = inputs.poll(now)
+        presses = inputs.presses
+        if self.start_ms is None:
+            self.start_ms = now
+            self.writer.add(0, state, presses)
+        else:
+            pressed = False
+            for i in range(self.n):
+                if presses[i]:
+                    pressed = True
+            if pressed or state != prev:
+                self.writer.add(time.ticks_diff(now, self.start_ms), state, presses)
+        self.state = state
+        self.pressed = inputs.pressed
+        self.released = inputs.released
+        return state
+
+
+class ReplayInputs(object):
+    """Inputs stand-in that plays a trace back against the caller's clock.
+
+    Note:  The trace starts at the first poll().  Presses of every record
+    that fell due since the previous poll are summed, so replaying with a
+    coarser step than the recording loses no taps.
+    """
+
+    def __init__(self, data):
+        """Initialize replay.
+
+        Args:
+            data (bytes): Trace contents (e.g. open(path, 'rb').read()).
+        """
+        self.n, self.records = read_trace(data)
+        self.index = 0
+        self.start_ms = None
+        self.state = 0
+        self.pressed = 0
+        self.released = 0
+        self.presses = bytearray(self.n)
+
+    def done(self):
+        """Return True once every record has been played."""
+        return self.index >= len(self.records)
+
+    def duration_ms(self):
+        """Return the trace length in ms."""
+        return self.records[-1][0] if self.records else 0
+
+    def poll(self, now):
+        """Apply records due at now; return the held bitmask."""
+        if self.start_ms is None:
+            self.start_ms = now
+        t = time.ticks_diff(now, self.start_ms)
+        prev = self.state
+        presses = self.presses
+        for i in range(self.n):
+            presses[i] = 0
+        records = self.records
+        while self.index < len(records) and records[self.index][0] <= t:
+            _, state, counts = records[self.index]
+            for i in range(self.n):
+                presses[i] = min(presses[i] + counts[i], 255)
+            self.state = state
+            self.index += 1
+        self.pressed = self.state & ~prev
+        self.released = prev & ~self.state
+        for i in range(self.n):
+            if presses[i]:
+                self.pressed |= 1 << i
+        return self.state
@@ -5,9 +5,23 @@ import st7789
 import gc
 
 from ili9341 import color565
+from tile import Tile, rect_union, rect_area
+from dial import DialCache
+from geometry import NeedleTable, tick_segments, circle_points
+from readout import Readout
 from config import display_lilygo_config, display_ili9341_config
 
-from icons import gas
+from assets import IconPack, IconCache
+from physics import FUEL_SCALE, FUEL_FULL, RATE_SCALE, wobble_table, idle_rpm, speed_rpm, burn_rate
+from scheduler import Scheduler
+from runtime import Runtime
+from pipeline import RenderPipeline
+from inputs import Inputs
+from inputtrace import RecordingInputs
+from timers import Periodic
+from animation import FRAME_MS, Needle, response_table
+from coverage import SHIFT, CoverageTable
+from profiler import PROFILE
 
 BLACK = color565(0, 0, 0)
 GREEN = color565(0, 255, 0)
@@ -18,13 +32,48 @@ PURPLE_TICK = color565(139, 0, 255)
 
 SPEED_COLOR = color565(199, 0, 56)
 
+# иконки в RGB565 big-endian, собираются tools/pack_icons.py
+ICONS_PATH = "icons.bin"
+
+# виджеты, которым профайлер SPI приписывает трафик (PROFILE.enable() в REPL)
+OUTER_WIDGETS = ("dial", "ticks", "needle", "number", "turn_arrows")
+INNER_WIDGETS = ("icons", "fuel_bars")
+
+# кнопки: номер бита в маске Inputs и GPIO (все активны по нулю)
+BTN_LEFT, BTN_RIGHT, BTN_GAS, BTN_THROTTLE = range(4)
+BUTTON_PINS = (0, 35, 32, 12)
+
+# путь для записи нажатий (inputtrace.py), чтобы потом воспроизвести на ПК; None — не писать
+RECORD_TRACE = None
+
+# True: подсистемы — задачи asyncio (runtime.Runtime); False: синхронный Scheduler
+USE_ASYNCIO = True
+
 
 class OuterDisplay:
-    def __init__(self):
+    TURN_ARROW_W = 10
+    TURN_ARROW_H = 6
+
+    # стрелки догоняют показания: постоянная времени, предел скорости (ед./с),
+    # период кадра анимации и сдвиг кончика в пути, ради которого стоит перерисовывать
+    NEEDLE_TAU_MS = 80
+    SPEED_SLEW = 400
+    RPM_SLEW = 16000
+    NEEDLE_FRAME_MS = FRAME_MS
+    NEEDLE_MIN_MOVE = 2
+    NEEDLE_SEGMENTS = 4  # на сколько кусков резать тайл при малом повороте
+    # сглаженные стрелки (coverage.py): покрытие из таблиц, смешивание с циферблатом по LUT
+    NEEDLE_AA = True
+
+    def __init__(self, max_speed=200, max_rpm=8000):
         self.display = display_ili9341_config()
+        # профайлер SPI: пробы подменяют шину только после PROFILE.enable()
+        PROFILE.attach_bus("outer", self.display)
+        self.prof = PROFILE.sections("outer", OUTER_WIDGETS)
         self.display.clear(BLACK)
 
         self.radius_outer = 70
+        self.needle_len = int(self.radius_outer * 0.8)
 
         self.cx_speed = 120
         self.cy_speed = 80
@@ -51,6 +100,45 @@ class OuterDisplay:
         self.turn_right_x = 200
         self.turn_right_y = 300
 
+        # имена областей экрана для каждого циферблата
+        self.dial_names = {
+            (self.cx_speed, self.cy_speed): "speed",
+            (self.cx_rpm, self.cy_rpm): "rpm",
+        }
+
+        # кэш статического циферблата под стрелкой: (cx, cy) -> DialCache
+        self.dial = {}
+
+        # таблицы геометрии: считаем тригонометрию один раз, дальше только индексы
+        self.needles = {}
+        self._needle_table(self.cx_speed, self.cy_speed, max_speed)
+        self._needle_table(self.cx_rpm, self.cy_rpm, max_rpm)
+        # покрытие для сглаживания: десятки маленьких массивов на все углы обеих стрелок
+        self.coverage = CoverageTable(self.needles.values()) if self.NEEDLE_AA else None
+        self.tick_tables = {}
+        self.circle_tables = {}
+
+        # анимация стрелок: кадр не чаще NEEDLE_FRAME_MS, положение — от прошедшего времени;
+        # ближе одного шага таблицы кончик уже не сдвинется
+        curve = response_table(self.NEEDLE_TAU_MS)
+        self.speed_anim = Needle(curve, self.needles[(self.cx_speed, self.cy_speed)].step,
+                                 self.SPEED_SLEW, self.NEEDLE_FRAME_MS)
+        self.rpm_anim = Needle(curve, self.needles[(self.cx_rpm, self.cy_rpm)].step,
+                               self.RPM_SLEW, self.NEEDLE_FRAME_MS)
+        self.next_frame_ms = None
+        self.skipped_frames = 0
+
+        # цифровые показания: перерисовываются только изменившиеся цифры
+        self.readouts = {
+            (self.cx_speed, self.cy_speed): Readout(self.display, self.cx_speed, self.cy_speed,
+                                                    "{:3d}", GREEN, BLACK),
+            (self.cx_rpm, self.cy_rpm): Readout(self.display, self.cx_rpm, self.cy_rpm,
+                                                "{:4d}", GREEN, BLACK),
+        }
+
+        # тайл под стрелку: old ∪ new берётся, только если он не больше двух отдельных
+        self.tile = Tile(self.display, 2 * (self.needle_len + 1) ** 2)
+
         # фон
         self.draw_background()
 
@@ -58,18 +146,25 @@ class OuterDisplay:
         self.display.clear(BLACK)
 
     def draw_circle_outline(self, cx, cy, r, color):
-        for ang in range(0, 360, 3):
-            rad = math.radians(ang)
-            x = int(cx + r * math.cos(rad))
-            y = int(cy + r * math.sin(rad))
-            self.display.draw_line(x, y, x, y, color)
-
-    def fill_rect_fast(self, x, y, w, h, color):
-        for yy in range(y, y + h):
-            self.display.draw_hline(x, yy, w, color)
+        key = (cx, cy, r)
+        xy = self.circle_tables.get(key)
+        if xy is None:
+            xy = self.circle_tables[key] = circle_points(cx, cy, r)
+
+        for i in range(0, len(xy), 2):
+            x = xy[i]
+            y = xy[i + 1]
+            self._dial_line(cx, cy, x, y, x, y, color)
+
+    def _dial_line(self, cx, cy, x1, y1, x2, y2, color):
+        self.display.draw_line(x1, y1, x2, y2, color)
+        cache = self.dial.get((cx, cy))
+        if cache is not None:
+            cache.line(x1, y1, x2, y2, color)
 
     def draw_one_background(self, cx, cy, label):
-        self.draw_circle_outline(cx, cy, self.radius_outer + 8, SPEED_COLOR)
+        n = self.needle_len
+        self.dial[(cx, cy)] = DialCache(cx - n, cy - n, 2 * n + 1, 2 * n + 1, BLACK)
 
         tw = len(label) * 8
         angle_text = math.radians(180)
@@ -78,72 +173,76 @@ class OuterDisplay:
         text_x = int(cx + text_radius * math.cos(angle_text)) - tw // 2
         text_y = int(cy + text_radius * math.sin(angle_text)) - 4
 
-        self.display.draw_text8x8(
-            text_x,
-            text_y,
-            label,
-            SPEED_COLOR,
-            BLACK,
-            rotate=90
-        )
-
-        self.draw_ticks(cx, cy)
+        # статика (обводка, подпись, риски) и динамика (стрелка, цифры)
+        name = self.dial_names[(cx, cy)]
+        r = self.radius_outer + 8
+        x0 = min(cx - r, text_x)
+        y0 = min(cy - r, text_y)
+        x1 = max(cx + r, text_x + 7)
+        y1 = max(cy + r, text_y + tw - 1)
+        regions = self.display.regions
+        regions.add(name + "_art", x0, y0, x1 - x0 + 1, y1 - y0 + 1, static=True)
+        regions.add(name, cx - n, cy - n, 2 * n + 1, 2 * n + 1)
+
+        with self.prof["dial"], regions[name + "_art"]:
+            self.draw_circle_outline(cx, cy, r, SPEED_COLOR)
+
+            self.display.draw_text8x8(
+                text_x,
+                text_y,
+                label,
+                SPEED_COLOR,
+                BLACK,
+                rotate=90
+            )
+
+            with self.prof["ticks"]:
+                self.draw_ticks(cx, cy)
+
+        with self.prof["dial"], regions[name]:
+            self._push_dial(cx, cy)
+
+    def _push_dial(self, cx, cy):
+        # окно под стрелкой берём из кэша, чтобы экран и кэш совпадали попиксельно
+        cache = self.dial[(cx, cy)]
+        tile = self.tile
+        band = max(1, tile.max_pixels // cache.w)
+        for y in range(cache.y, cache.y + cache.h, band):
+            y1 = min(y + band, cache.y + cache.h) - 1
+            if tile.begin(cache.x, y, cache.x + cache.w - 1, y1, BLACK) is None:
+                continue
+            cache.restore(tile)
+            tile.push()
 
     def draw_ticks(self, cx, cy, num_major=13, num_minor=4):
+        key = (cx, cy, num_major, num_minor)
+        tables = self.tick_tables.get(key)
+        if tables is None:
+            tables = tick_segments(cx, cy, self.radius_outer, num_major, num_minor)
+            self.tick_tables[key] = tables
 
-        start_angle = 225
-        total_span = 270
-
-        if num_major < 2:
-            return
-
-        step_major = total_span / (num_major - 1)
-
-        for i in range(num_major):
-            angle_deg = start_angle + i * step_major
-            rad = math.radians(angle_deg)
-
-            inner_r = self.radius_outer - 18
-            outer_r = self.radius_outer - 2
-
-            x1 = int(cx + inner_r * math.cos(rad))
-            y1 = int(cy + inner_r * math.sin(rad))
-            x2 = int(cx + outer_r * math.cos(rad))
-            y2 = int(cy + outer_r * math.sin(rad))
-
-            self.display.draw_line(x1, y1, x2, y2, PURPLE_TICK)
-
-            if i < num_major - 1 and num_minor > 0:
-                step_minor = step_major / (num_minor + 1)
-
-                for j in range(1, num_minor + 1):
-                    a = angle_deg + j * step_minor
-                    arad = math.radians(a)
-
-                    inner_m = self.radius_outer - 12
-                    outer_m = self.radius_outer - 4
-
-                    mx1 = int(cx + inner_m * math.cos(arad))
-                    my1 = int(cy + inner_m * math.sin(arad))
-                    mx2 = int(cx + outer_m * math.cos(arad))
-                    my2 = int(cy + outer_m * math.sin(arad))
-
-                    self.display.draw_line(mx1, my1, mx2, my2, GREEN_TICK)
+        for seg, color in zip(tables, (PURPLE_TICK, GREEN_TICK)):
+            for i in range(0, len(seg), 4):
+                self._dial_line(cx, cy, seg[i], seg[i + 1], seg[i + 2], seg[i + 3], color)
 
     def draw_background(self):
+        regions = self.display.regions
+        regions.reset()
         self.display.clear(BLACK)
+        self.dial = {}
+        for readout in self.readouts.values():
+            readout.invalidate()
         self.draw_one_background(self.cx_speed, self.cy_speed, "KM/H")
         self.draw_one_background(self.cx_rpm, self.cy_rpm, "RPM")
 
+        w = self.TURN_ARROW_W
+        h = self.TURN_ARROW_H
+        regions.add("turn_left", self.turn_left_x - w, self.turn_left_y - h, 2 * w + 1, 2 * h + 1)
+        regions.add("turn_right", self.turn_right_x - w, self.turn_right_y - h, 2 * w + 1, 2 * h + 1)
         self.draw_turn_signals(False, False)
 
-    def draw_number_center(self, cx, cy, text):
-        w = len(text) * 8
-        h = 8
-        x0 = cx - w // 2
-        y0 = cy - h // 2
-        self.fill_rect_fast(x0 - 2, y0 - 2, w + 4, h + 4, BLACK)
-        self.display.draw_text8x8(x0, y0, text, GREEN, BLACK, rotate=90)
+        # статика нарисована: запираем её, пустые строки панель не сканирует
+        regions.freeze()
 
     def _draw_turn_arrow(self, x, y, on, is_left, prev_attr_name):
         prev = getattr(self, prev_attr_name)
@@ -151,10 +250,8 @@ class OuterDisplay:
         if prev is not None and prev == on:
             return
 
-        w = 10
-        h = 6
-
-        self.fill_rect_fast(x - w - 3, y - h - 3, 2 * (w + 3), 2 * (h + 3), BLACK)
+        w = self.TURN_ARROW_W
+        h = self.TURN_ARROW_H
 
         color_on = GREEN_TICK
         color_off = color565(40, 40, 40)
@@ -169,9 +266,15 @@ class OuterDisplay:
             p2 = (x - w, y - h)
             p3 = (x + w, y - h)
 
-        self.display.draw_line(p1[0], p1[1], p2[0], p2[1], col)
-        self.display.draw_line(p2[0], p2[1], p3[0], p3[1], col)
-        self.display.draw_line(p3[0], p3[1], p1[0], p1[1], col)
+        # треугольник целиком одним окном: фон под ним всегда чёрный
+        with self.prof["turn_arrows"], self.display.regions["turn_left" if is_left else "turn_right"]:
+            self.display.draw_lines_batch(
+                (p1[0], p1[1], p2[0], p2[1],
+                 p2[0], p2[1], p3[0], p3[1],
+                 p3[0], p3[1], p1[0], p1[1]),
+                col,
+                BLACK
+            )
 
         setattr(self, prev_attr_name, on)
 
@@ -179,69 +282,170 @@ class OuterDisplay:
         self._draw_turn_arrow(self.turn_left_x,  self.turn_left_y,  left_on,  True,  "prev_left_on")
         self._draw_turn_arrow(self.turn_right_x, self.turn_right_y, right_on, False, "prev_right_on")
 
-    def _value_to_angle_deg(self, value, max_value):
+    def _needle_table(self, cx, cy, max_value):
+        table = self.needles.get((cx, cy))
+        if table is None or table.max_value != max_value:
+            table = NeedleTable(cx, cy, self.needle_len, max_value)
+            self.needles[(cx, cy)] = table
+        return table
 
-        if max_value <= 0:
-            return 225
-
-        ratio = value / max_value
-        ratio = max(0, min(1, ratio))
-
-        start_angle = 225
-        total_span = 270
-
-        angle = start_angle + ratio * total_span
+    def _render_needle_tile(self, cx, cy, box, x, y, color):
+        tile = self.tile
+        if tile.begin(box[0], box[1], box[2], box[3], BLACK) is None:
+            return
 
-        return angle
+        # восстанавливаем циферблат из кэша, затем рисуем новую стрелку
+        cache = self.dial.get((cx, cy))
+        if cache is not None:
+            cache.restore(tile)
 
-    def _draw_needle(self, cx, cy, value, max_value, color, prev_value_attr_name):
+        if self.coverage is not None and cache is not None:
+            self.coverage.draw(tile, cache, cache.blend_lut(color, SHIFT), cx, cy, x, y)
+        else:
+            tile.line(cx, cy, x, y, color)
+
+        # цифры поверх стрелки, чтобы тайл их не затирал
+        readout = self.readouts.get((cx, cy))
+        if readout is not None:
+            readout.composite(tile)
+
+        tile.push()
+
+    def _segment_boxes(self, cx, cy, px, py, x, y):
+        # старая и новая стрелки, порезанные на равные куски; рамка каждого куска
+        # с запасом в пиксель покрывает все точки Брезенхэма на нём
+        n = self.needle_len
+        k = self.NEEDLE_SEGMENTS
+        boxes = []
+        ox0 = nx0 = cx
+        oy0 = ny0 = cy
+        for i in range(1, k + 1):
+            ox1 = cx + (px - cx) * i // k
+            oy1 = cy + (py - cy) * i // k
+            nx1 = cx + (x - cx) * i // k
+            ny1 = cy + (y - cy) * i // k
+            boxes.append((max(min(ox0, ox1, nx0, nx1) - 1, cx - n),
+                          max(min(oy0, oy1, ny0, ny1) - 1, cy - n),
+                          min(max(ox0, ox1, nx0, nx1) + 1, cx + n),
+                          min(max(oy0, oy1, ny0, ny1) + 1, cy + n)))
+            ox0, oy0, nx0, ny0 = ox1, oy1, nx1, ny1
+        return boxes
+
+    def _draw_needle(self, cx, cy, value, max_value, color, prev_value_attr_name, min_move=1):
         prev_value = getattr(self, prev_value_attr_name)
 
         if prev_value is not None and prev_value == value:
             return
 
-        needle_len = int(self.radius_outer * 0.8)
-
-        if prev_value is not None:
-            prev_angle_deg = self._value_to_angle_deg(prev_value, max_value)
-            prev_rad = math.radians(prev_angle_deg)
-            px = int(cx + needle_len * math.cos(prev_rad))
-            py = int(cy + needle_len * math.sin(prev_rad))
-            self.display.draw_line(cx, cy, px, py, BLACK)
+        table = self._needle_table(cx, cy, max_value)
+        x, y = table.end(value)
+        new_box = (min(cx, x), min(cy, y), max(cx, x), max(cy, y))
 
-        angle_deg = self._value_to_angle_deg(value, max_value)
-        rad = math.radians(angle_deg)
-        x = int(cx + needle_len * math.cos(rad))
-        y = int(cy + needle_len * math.sin(rad))
-        self.display.draw_line(cx, cy, x, y, color)
+        if prev_value is None:
+            boxes = (new_box,)
+        else:
+            px, py = table.end(prev_value)
+            if abs(px - x) < min_move and abs(py - y) < min_move:
+                # кончик стрелки сдвинулся меньше min_move пикселей: на экране старая
+                if px == x and py == y:
+                    setattr(self, prev_value_attr_name, value)
+                return
+            old_box = (min(cx, px), min(cy, py), max(cx, px), max(cy, py))
+            union = rect_union(old_box, new_box)
+            if rect_area(union) <= rect_area(old_box) + rect_area(new_box):
+                boxes = (union,)
+            else:
+                boxes = (old_box, new_box)
+            # при малом повороте полосы вдоль стрелки меньше одного большого тайла
+            # (запаса в пиксель хватает и сглаженной стрелке)
+            segments = self._segment_boxes(cx, cy, px, py, x, y)
+            if sum(rect_area(b) for b in segments) < sum(rect_area(b) for b in boxes):
+                boxes = segments
+
+        # одна запись block на тайл вместо block на каждый пиксель
+        with self.prof["needle"], self.display.regions[self.dial_names[(cx, cy)]]:
+            for box in boxes:
+                self._render_needle_tile(cx, cy, box, x, y, color)
 
         setattr(self, prev_value_attr_name, value)
 
-    def update(self, speed, rpm, max_speed, max_rpm):
+    def animating(self):
+        return self.speed_anim.moving() or self.rpm_anim.moving()
+
+    def frame_wait(self, now):
+        # сколько мс до следующего кадра анимации
+        if self.next_frame_ms is None:
+            return 0
+        d = time.ticks_diff(self.next_frame_ms, now)
+        return d if d > 0 else 0
+
+    def _min_move(self, needle):
+        # в пути мелкие сдвиги копятся, на месте стрелка встаёт точно
+        return self.NEEDLE_MIN_MOVE if needle.moving() else 1
+
+    def _frame_due(self, now):
+        if self.next_frame_ms is not None:
+            late = time.ticks_diff(now, self.next_frame_ms)
+            if late < 0:
+                return False
+            # панель не успевала: пропущенные кадры не догоняем, стрелка просто дальше
+            self.skipped_frames += late // self.NEEDLE_FRAME_MS
+        self.next_frame_ms = time.ticks_add(now, self.NEEDLE_FRAME_MS)
+        return True
+
+    def update(self, speed, rpm, max_speed, max_rpm, now=None):
         if speed < 0: speed = 0
         if rpm < 0: rpm = 0
         if speed > max_speed: speed = max_speed
         if rpm > max_rpm: rpm = max_rpm
 
-        # speed
-        self._draw_needle(self.cx_speed, self.cy_speed, speed, max_speed,
-                          SPEED_COLOR, "prev_speed_value")
-        self.draw_number_center(self.cx_speed, self.cy_speed, "{:3d}".format(int(speed)))
+        regions = self.display.regions
+        speed_needle = self.speed_anim
+        rpm_needle = self.rpm_anim
+
+        # без времени (загрузка) стрелки ставятся сразу
+        if now is None:
+            speed_needle.snap(speed)
+            rpm_needle.snap(rpm)
+            frame = True
+        else:
+            speed_needle.set(speed, now)
+            rpm_needle.set(rpm, now)
+            frame = self._frame_due(now)
+            if frame:
+                speed_needle.advance(now)
+                rpm_needle.advance(now)
+
+        # speed: стрелка — анимированное значение, цифры — целевое
+        if frame:
+            self._draw_needle(self.cx_speed, self.cy_speed, speed_needle.value(), max_speed,
+                              SPEED_COLOR, "prev_speed_value", self._min_move(speed_needle))
+        with self.prof["number"], regions["speed"]:
+            self.readouts[(self.cx_speed, self.cy_speed)].draw(speed)
 
         # rpm
-        self._draw_needle(self.cx_rpm, self.cy_rpm, rpm, max_rpm,
-                          WHITE, "prev_rpm_value")
-        self.draw_number_center(self.cx_rpm, self.cy_rpm, "{:4d}".format(int(rpm)))
+        if frame:
+            self._draw_needle(self.cx_rpm, self.cy_rpm, rpm_needle.value(), max_rpm,
+                              WHITE, "prev_rpm_value", self._min_move(rpm_needle))
+        with self.prof["number"], regions["rpm"]:
+            self.readouts[(self.cx_rpm, self.cy_rpm)].draw(rpm)
+
+        # стрелки на месте: следующее изменение рисуется сразу
+        if not self.animating():
+            self.next_frame_ms = None
 
 
 class InnerDisplay:
     ICON_W = 48
     ICON_H = 48
+    ICON_SLOTS = 4  # сколько иконок держим в RAM
 
     def __init__(self, display_factory, bg=0x0000):
         gc.collect()
         self.display = display_factory()
         self.display.init()
+        PROFILE.attach_driver("inner", self)
+        self.prof = PROFILE.sections("inner", INNER_WIDGETS)
         self._backlight_on()
 
         self.bg = bg
@@ -249,10 +453,10 @@ class InnerDisplay:
 
         self.sw, self.sh = self.size()
 
-        # icon
-        self._icon_buf = bytearray(self.ICON_W * self.ICON_H * 2)
-        self._icon_ready = False
-        self._icon_src_id = None
+        # иконки: атлас во флеше, последние ICON_SLOTS штук в RAM
+        self.icons = IconCache(IconPack(ICONS_PATH), self.ICON_SLOTS)
+        # что сейчас на экране: (x, y) -> (name, w, h)
+        self.shown = {}
 
         # fuel
         self.icon_x = 0
@@ -270,7 +474,7 @@ class InnerDisplay:
 
         self.prev_fuel_bars = None
 
-        self.center_icon_48(gas)
+        self.center_icon_48("gas")
         self.fuel_ui_init()
 
     def _backlight_on(self):
@@ -297,6 +501,7 @@ class InnerDisplay:
         return int(w), int(h)
 
     def clear(self, color=0x0000):
+        self.shown = {}
         d = self.display
         try:
             d.fill(color)
@@ -321,76 +526,78 @@ class InnerDisplay:
             for yy in range(y, y + h):
                 d.draw_hline(x, yy, w, color)
 
-    def _fill_icon_buf_from_u16(self, icon_u16):
-        buf = self._icon_buf
-        i = 0
-        for c in icon_u16:
-            buf[i]     = (c >> 8) & 0xFF
-            buf[i + 1] = c & 0xFF
-            i += 2
-
-        self._icon_ready = True
-
-    def set_icon_48(self, icon_u16, force=False):
-        src_id = id(icon_u16)
-        if (not force) and self._icon_ready and (self._icon_src_id == src_id):
+    def show_icon(self, name, x, y, force=False):
+        x = int(x); y = int(y)
+        shown = self.shown.get((x, y))
+        if (not force) and shown is not None and shown[0] == name:
             return
 
-        self._fill_icon_buf_from_u16(icon_u16)
-        self._icon_src_id = src_id
+        w, h = self.icons.pack.size(name)
+        # иконки, которые перекроет новая, больше не на экране
+        for pos, (_, sw, sh) in list(self.shown.items()):
+            if (pos[0] < x + w and x < pos[0] + sw
+                    and pos[1] < y + h and y < pos[1] + sh):
+                del self.shown[pos]
 
-    def blit_icon_48(self, x, y):
-        if not self._icon_ready:
-            return
-        self.display.blit_buffer(self._icon_buf, int(x), int(y), self.ICON_W, self.ICON_H)
+        with self.prof["icons"]:
+            self.display.blit_buffer(self.icons.get(name), x, y, w, h)
+        self.shown[(x, y)] = (name, w, h)
 
-    def center_icon_48(self, icon_u16):
+    def center_icon_48(self, name):
         self.icon_x = (self.sw // 2) - (self.ICON_W // 2)
         self.icon_y = (self.sh // 2) - (self.ICON_H // 2)
 
-        self.set_icon_48(icon_u16)
-        self.blit_icon_48(self.icon_x, self.icon_y)
+        self.show_icon(name, self.icon_x, self.icon_y)
 
     def fuel_ui_init(self):
         self.fuel_x = self.icon_x + self.ICON_W + 8
         self.fuel_y = self.icon_y + 18
 
-    def _fuel_to_bars(self, fuel_percent):
-        if fuel_percent <= 0:
+    def _fuel_to_bars(self, fuel_mp):
+        if fuel_mp <= 0:
             return 0
-        if fuel_percent <= 33:
+        if fuel_mp <= 33 * FUEL_SCALE:
             return 1
-        if fuel_percent <= 66:
+        if fuel_mp <= 66 * FUEL_SCALE:
             return 2
         return 3
 
-    def draw_fuel_bars(self, fuel_percent):
-        bars = self._fuel_to_bars(fuel_percent)
+    def draw_fuel_bars(self, fuel_mp):
+        # топливо в тысячных долях процента
+        bars = self._fuel_to_bars(fuel_mp)
         if self.prev_fuel_bars is not None and bars == self.prev_fuel_bars:
             return
 
-        total_w = 3 * self.fuel_bar_w + 2 * self.fuel_gap + 6
-        total_h = self.fuel_bar_h + 6
-        self.fill_rect(self.fuel_x - 3, self.fuel_y - 3, total_w, total_h, self.FUEL_BG)
+        with self.prof["fuel_bars"]:
+            total_w = 3 * self.fuel_bar_w + 2 * self.fuel_gap + 6
+            total_h = self.fuel_bar_h + 6
+            self.fill_rect(self.fuel_x - 3, self.fuel_y - 3, total_w, total_h, self.FUEL_BG)
 
-        d = self.display
-        for i in range(3):
-            x = self.fuel_x + i * (self.fuel_bar_w + self.fuel_gap)
-            y = self.fuel_y
+            d = self.display
+            for i in range(3):
+                x = self.fuel_x + i * (self.fuel_bar_w + self.fuel_gap)
+                y = self.fuel_y
 
-            self.fill_rect(x, y, self.fuel_bar_w, self.fuel_bar_h, self.FUEL_OFF)
+                self.fill_rect(x, y, self.fuel_bar_w, self.fuel_bar_h, self.FUEL_OFF)
 
-            if i < bars:
-                self.fill_rect(x, y, self.fuel_bar_w, self.fuel_bar_h, self.FUEL_ON)
+                if i < bars:
+                    self.fill_rect(x, y, self.fuel_bar_w, self.fuel_bar_h, self.FUEL_ON)
 
-            if hasattr(d, "rect"):
-                d.rect(int(x), int(y), int(self.fuel_bar_w), int(self.fuel_bar_h), self.FUEL_OUT)
+                if hasattr(d, "rect"):
+                    d.rect(int(x), int(y), int(self.fuel_bar_w), int(self.fuel_bar_h), self.FUEL_OUT)
 
         self.prev_fuel_bars = bars
 
 
 class ESP32:
-    def __init__(self, outer_display: OuterDisplay, max_speed, max_rpm, idle_rpm):
+    # второй поток для внутреннего экрана: под GIL запись SPI его не отпускает,
+    # выигрыша нет (см. frame_inline/frame_threaded в bench/suite.py)
+    PIPELINE_THREADED = False
+
+    def __init__(self, outer_display: OuterDisplay, max_speed, max_rpm, idle_rpm,
+                 ticks_ms=None, inputs=None):
+        # часы и кнопки можно подменить (inputtrace.ReplayInputs + виртуальное время)
+        self.ticks_ms = ticks_ms or time.ticks_ms
 
         self.display = InnerDisplay(display_lilygo_config, bg=0x0000)
 
@@ -400,41 +607,47 @@ class ESP32:
         self.max_rpm = max_rpm
         self.idle_rpm = idle_rpm
 
+        # колебания оборотов (таблица синуса: на шаге нет float)
+        self.IDLE_WOBBLE_AMPL = 80
+        self.IDLE_WOBBLE_PERIOD_MS = 900
+        self.IDLE_NOISE_AMPL = 25
+        self.IDLE_UPDATE_MS = 120
+        self.idle_timer = Periodic(self.IDLE_UPDATE_MS, self.ticks_ms())
+        self.wobble = wobble_table(self.IDLE_WOBBLE_AMPL, self.IDLE_WOBBLE_PERIOD_MS)
+
+        # целые числа: скорость в км/ч, топливо в тысячных долях процента
         self.curr_speed = 0
-        self.curr_fuel = 0
-        self.curr_rpm = self.compute_rpm(self.curr_speed, self.curr_fuel)
+        self.curr_fuel_mp = 0
+        self.curr_rpm = self.compute_rpm(self.curr_speed, self.curr_fuel_mp)
 
-        self.display.draw_fuel_bars(self.curr_fuel)
+        self.display.draw_fuel_bars(self.curr_fuel_mp)
         self.outer_display.update(self.curr_speed, self.curr_rpm, self.max_speed, self.max_rpm)
 
         # заправка
-        self.REFUEL_RATE_PER_SEC = 10
-        self.last_refuel_ms = time.ticks_ms()
-
-        # расход топлива от RPM
-        self.FUEL_BASE_PER_SEC = 0.5
-        self.FUEL_MAX_PER_SEC  = 2
-        self.last_fuel_ms = time.ticks_ms()
+        self.REFUEL_MP_PER_SEC = 10 * FUEL_SCALE
+        self.last_refuel_ms = self.ticks_ms()
+
+        # расход топлива от RPM (миллионные доли процента в секунду)
+        self.FUEL_BASE_UP_PER_SEC = 500000
+        self.FUEL_MAX_UP_PER_SEC  = 2000000
+        self.last_fuel_ms = self.ticks_ms()
+        self.fuel_rem = 0  # остаток расхода меньше 1 мп, в единицах RATE_SCALE
         self.NO_FUEL_DECAY_STEP = 3
 
         # затухание скорости
         self.DECAY_INTERVAL_MS = 200
         self.DECAY_STEP_KMH = 1
-        self.last_decay_ms = time.ticks_ms()
-
-        # кнопка "газ"
-        self._btn_turn_pressed = False
-        self.btn_turn = Pin(12, Pin.IN, Pin.PULL_UP)
-        self.btn_turn.irq(trigger=Pin.IRQ_FALLING, handler=self._btn_turn_irq)
+        self.decay_timer = Periodic(self.DECAY_INTERVAL_MS, self.ticks_ms())
 
-        # кнопка "заправки"
-        self.btn_gas = Pin(32, Pin.IN, Pin.PULL_UP)
+        # кнопки: прерывания по фронтам + антидребезг, опрос одним чтением регистров
+        self.inputs = inputs or Inputs(BUTTON_PINS)
+        self.throttle_presses = 0  # нажатия "газа", ещё не применённые pedals
 
         # пищалка
         self.buzzer = Pin(17, Pin.OUT)
         self.buzzer.off()
         self.BUZZER_INTERVAL_MS = 400
-        self.last_buzzer_ms = time.ticks_ms()
+        self.buzzer_timer = Periodic(self.BUZZER_INTERVAL_MS, self.ticks_ms())
         self.buzzer_state = False
 
         #  поворотники (светодиоды)
@@ -443,67 +656,103 @@ class ESP32:
         self.led_right.off()
         self.led_left.off()
 
-        # поворотники (кнопки)
-        self.btn_left  = Pin(0,  Pin.IN, Pin.PULL_UP)
-        self.btn_right = Pin(35, Pin.IN, Pin.PULL_UP)
-
         # мигание поворотников
         self.BLINK_INTERVAL_MS = 500
-        self.last_blink_ms = time.ticks_ms()
+        self.blink_timer = Periodic(self.BLINK_INTERVAL_MS, self.ticks_ms())
         self.blink_state = False
 
-        # колебания оборотов
-        self.IDLE_WOBBLE_AMPL = 80
-        self.IDLE_WOBBLE_PERIOD_MS = 900
-        self.IDLE_NOISE_AMPL = 25
-        self.IDLE_UPDATE_MS = 120
-        self.last_idle_ms = time.ticks_ms()
+        # состояние кнопок (обновляет read_buttons)
+        self.left_pressed = False
+        self.right_pressed = False
+        self.gas_pressed = False
+
+        # состояние для отрисовки: step() только меняет его, render() рисует
+        self.left_on = False
+        self.right_on = False
+        self.dirty = False
 
-    # <---------- IRQ ---------->
-    def _btn_turn_irq(self, pin):
-        self._btn_turn_pressed = True
+        # экраны на разных шинах SPI: внутренний можно рисовать во втором потоке
+        self.pipeline = RenderPipeline(self.PIPELINE_THREADED)
+        self.frame_fuel_mp = self.curr_fuel_mp
 
    # <---------- Логика оборотов ---------->
-    def compute_rpm(self, curr_speed, curr_fuel):
-        if curr_fuel <= 0:
+    def compute_rpm(self, curr_speed, curr_fuel_mp, now=None):
+        if curr_fuel_mp <= 0:
             return 0
 
         if curr_speed <= 0:
-            now = time.ticks_ms()
-
-            phase = (now % self.IDLE_WOBBLE_PERIOD_MS) / self.IDLE_WOBBLE_PERIOD_MS
-            wobble = math.sin(2 * math.pi * phase) * self.IDLE_WOBBLE_AMPL
-
-            noise = ((now // 37) % (2 * self.IDLE_NOISE_AMPL + 1)) - self.IDLE_NOISE_AMPL
+            if now is None:
+                now = self.ticks_ms()
+            return idle_rpm(now, self.idle_rpm, self.wobble, self.IDLE_NOISE_AMPL, self.max_rpm)
 
-            rpm = self.idle_rpm + wobble + noise
-
-            if rpm < 0:
-                rpm = 0
-            if rpm > self.max_rpm:
-                rpm = self.max_rpm
-
-            return int(rpm)
-
-        ratio = curr_speed / self.max_speed
-        ratio = max(0, min(1, ratio))
-        rpm = self.idle_rpm + ratio * (self.max_rpm - self.idle_rpm)
-        return int(rpm)
+        return speed_rpm(curr_speed, self.max_speed, self.idle_rpm, self.max_rpm)
 
     def process(self):
+        self.step()
+        self.render()
+
+    def render(self):
+        # один кадр с последним состоянием, сколько бы шагов ни прошло
+        self.outer_display.draw_turn_signals(left_on=self.left_on, right_on=self.right_on)
+
+        if self.dirty:
+            self.dirty = False
+            # внешний экран в этом потоке, топливо параллельно в рабочем
+            self.frame_fuel_mp = self.curr_fuel_mp
+            self.pipeline.run(self.render_outer, self.render_inner)
+        elif self.outer_display.animating():
+            # состояние то же, но стрелки ещё в пути
+            self.render_outer()
+
+    def render_outer(self):
+        self.outer_display.update(self.curr_speed, self.curr_rpm, self.max_speed, self.max_rpm,
+                                  self.ticks_ms())
+
+    def render_inner(self):
+        # рабочий поток читает снимок, а не живое состояние
+        self.display.draw_fuel_bars(self.frame_fuel_mp)
+
+    def close(self):
+        # останавливает рабочий поток; без этого он живёт вечно
+        self.pipeline.close()
+
+    def step(self):
+        now = self.ticks_ms()
+
+        self.read_buttons(now)
+
+        changed = self.pedals(now)
+        if self.decay(now):
+            changed = True
+        if self.burn_fuel(now):
+            changed = True
+        self.buzz(now)
+        self.blink(now)
+        self.turn_outputs()
+        self.idle(now)
+
+        self.commit(changed)
+        return changed
+
+    # <---------- Подсистемы (step() или отдельные задачи runtime) ---------->
+    def read_buttons(self, now):
+        inputs = self.inputs
+        state = inputs.poll(now)
+        self.left_pressed  = bool(state & (1 << BTN_LEFT))
+        self.right_pressed = bool(state & (1 << BTN_RIGHT))
+        self.gas_pressed   = bool(state & (1 << BTN_GAS))
+        # каждое нажатие, даже если кадр затянулся и их было несколько
+        self.throttle_presses += inputs.presses[BTN_THROTTLE]
+
+    def pedals(self, now):
         changed = False
-        now = time.ticks_ms()
-
-        left_pressed  = (self.btn_left.value() == 0)
-        right_pressed = (self.btn_right.value() == 0)
-        gas_pressed   = (self.btn_gas.value() == 0)
 
-        if self.curr_fuel <= 0:
-            self._btn_turn_pressed = False
+        if self.curr_fuel_mp <= 0:
+            self.throttle_presses = 0
 
         # 1) Заправка только при speed==0
-        if gas_pressed:
-            self._btn_turn_pressed = False
+        if self.gas_pressed:
+            self.throttle_presses = 0
 
             if self.curr_speed > 0:
                 self.curr_speed -= 2
@@ -517,104 +766,122 @@ class ESP32:
                     steps = dt_ms // 1000
                     self.last_refuel_ms = time.ticks_add(self.last_refuel_ms, steps * 1000)
 
-                    self.curr_fuel += steps * self.REFUEL_RATE_PER_SEC
-                    if self.curr_fuel > 100:
-                        self.curr_fuel = 100
+                    self.curr_fuel_mp += steps * self.REFUEL_MP_PER_SEC
+                    if self.curr_fuel_mp > FUEL_FULL:
+                        self.curr_fuel_mp = FUEL_FULL
                     changed = True
         else:
             self.last_refuel_ms = now
 
             # 2) Газ только если есть топливо
-            if self._btn_turn_pressed:
-                self._btn_turn_pressed = False
-                if self.curr_fuel > 0:
+            if self.throttle_presses:
+                presses = self.throttle_presses
+                self.throttle_presses = 0
+                if self.curr_fuel_mp > 0:
                     if self.curr_speed < self.max_speed:
-                        self.curr_speed += 5
+                        self.curr_speed += 5 * presses
                         if self.curr_speed > self.max_speed:
                             self.curr_speed = self.max_speed
                         changed = True
 
-        # 3) Затухание скорости
-        if time.ticks_diff(now, self.last_decay_ms) >= self.DECAY_INTERVAL_MS:
-            self.last_decay_ms = now
+        return changed
+
+    def decay(self, now):
+        # 3) Затухание скорости: после задержки кадра — все пропущенные интервалы сразу
+        n = self.decay_timer.elapsed(now)
+        if n:
             if self.curr_speed > 0:
-                step = self.NO_FUEL_DECAY_STEP if (self.curr_fuel <= 0) else self.DECAY_STEP_KMH
-                self.curr_speed -= step
+                step = self.NO_FUEL_DECAY_STEP if (self.curr_fuel_mp <= 0) else self.DECAY_STEP_KMH
+                self.curr_speed -= n * step
                 if self.curr_speed < 0:
                     self.curr_speed = 0
-                changed = True
+                return True
+        return False
 
+    def burn_fuel(self, now):
         # 4) Расход топлива от RPM
-        if (not gas_pressed) and self.curr_speed > 0 and self.curr_fuel > 0:
-            self.curr_rpm = self.compute_rpm(self.curr_speed, self.curr_fuel)
+        if (not self.gas_pressed) and self.curr_speed > 0 and self.curr_fuel_mp > 0:
+            self.curr_rpm = self.compute_rpm(self.curr_speed, self.curr_fuel_mp, now)
 
-            rpm_ratio = self.curr_rpm / self.max_rpm
-            rpm_ratio = 0 if rpm_ratio < 0 else (1 if rpm_ratio > 1 else rpm_ratio)
-
-            burn_per_sec = self.FUEL_BASE_PER_SEC + rpm_ratio * (self.FUEL_MAX_PER_SEC - self.FUEL_BASE_PER_SEC)
+            burn_per_sec = burn_rate(self.curr_rpm, self.max_rpm,
+                                     self.FUEL_BASE_UP_PER_SEC, self.FUEL_MAX_UP_PER_SEC)
 
             dt_ms = time.ticks_diff(now, self.last_fuel_ms)
             if dt_ms > 0:
                 self.last_fuel_ms = now
-                self.curr_fuel -= burn_per_sec * (dt_ms / 1000.0)
-                if self.curr_fuel < 0:
-                    self.curr_fuel = 0
-                changed = True
+                # остаток деления копится, поэтому шаги по 10 мс не теряют расход
+                burned = burn_per_sec * dt_ms + self.fuel_rem
+                self.fuel_rem = burned % RATE_SCALE
+                self.curr_fuel_mp -= burned // RATE_SCALE
+                if self.curr_fuel_mp < 0:
+                    self.curr_fuel_mp = 0
+                return True
         else:
             self.last_fuel_ms = now
+            self.fuel_rem = 0
+        return False
 
+    def buzz(self, now):
         # 5) Пищалка при пустом баке
-        if self.curr_fuel <= 0:
-            if time.ticks_diff(now, self.last_buzzer_ms) >= self.BUZZER_INTERVAL_MS:
-                self.last_buzzer_ms = now
-                self.buzzer_state = not self.buzzer_state
+        if self.curr_fuel_mp <= 0:
+            n = self.buzzer_timer.elapsed(now)
+            if n:
+                # нечётное число пропущенных переключений меняет состояние
+                self.buzzer_state = self.buzzer_state != bool(n & 1)
                 self.buzzer.value(1 if self.buzzer_state else 0)
         else:
             self.buzzer_state = False
             self.buzzer.off()
+            self.buzzer_timer.arm()
 
+    def blink(self, now):
         # 6) Поворотники
-        if left_pressed or right_pressed:
-            if time.ticks_diff(now, self.last_blink_ms) >= self.BLINK_INTERVAL_MS:
-                self.last_blink_ms = now
+        if self.left_pressed or self.right_pressed:
+            n = self.blink_timer.elapsed(now)
+            if n & 1:
                 self.blink_state = not self.blink_state
         else:
             self.blink_state = False
+            self.blink_timer.arm()
 
-        if left_pressed:
+    def turn_outputs(self):
+        if self.left_pressed:
             self.led_left.on() if self.blink_state else self.led_left.off()
         else:
             self.led_left.off()
 
-        if right_pressed:
+        if self.right_pressed:
             self.led_right.on() if self.blink_state else self.led_right.off()
         else:
             self.led_right.off()
 
-        self.outer_display.draw_turn_signals(
-            left_on=(left_pressed and self.blink_state),
-            right_on=(right_pressed and self.blink_state)
-        )
+        self.left_on = self.left_pressed and self.blink_state
+        self.right_on = self.right_pressed and self.blink_state
 
+    def idle(self, now):
         # 7) Холостой ход
-        if (self.curr_speed <= 0) and (self.curr_fuel > 0) and (not gas_pressed):
-            if time.ticks_diff(now, self.last_idle_ms) >= self.IDLE_UPDATE_MS:
-                self.last_idle_ms = now
-                new_rpm = self.compute_rpm(self.curr_speed, self.curr_fuel)
+        if (self.curr_speed <= 0) and (self.curr_fuel_mp > 0) and (not self.gas_pressed):
+            # сколько бы интервалов ни прошло, важны только текущие обороты
+            if self.idle_timer.elapsed(now):
+                new_rpm = self.compute_rpm(self.curr_speed, self.curr_fuel_mp, now)
                 if new_rpm != self.curr_rpm:
                     self.curr_rpm = new_rpm
-                    self.outer_display.update(self.curr_speed, self.curr_rpm, self.max_speed, self.max_rpm)
+                    self.dirty = True
+        else:
+            self.idle_timer.arm()
 
-        # 8) Обновление приборов
+    def commit(self, changed):
+        # 8) Обновление приборов (рисует render)
         if changed:
-            self.curr_rpm = self.compute_rpm(self.curr_speed, self.curr_fuel)
-
-            self.outer_display.update(self.curr_speed, self.curr_rpm, self.max_speed, self.max_rpm)
-            self.display.draw_fuel_bars(self.curr_fuel)
+            self.curr_rpm = self.compute_rpm(self.curr_speed, self.curr_fuel_mp)
+            self.dirty = True
 
+        # периодический отчёт профайлера в UART
+        if PROFILE.enabled:
+            PROFILE.poll()
 
 if __name__ == "__main__":
-    outer = OuterDisplay()
+    outer = OuterDisplay(max_speed=200, max_rpm=8000)
     esp = ESP32(
         outer_display=outer,
         max_speed=200,
@@ -622,6 +889,17 @@ if __name__ == "__main__":
         idle_rpm=800,
     )
 
-    while True:
-        esp.process()
-        time.sleep_ms(10)
+    if RECORD_TRACE:
+        esp.inputs = RecordingInputs(esp.inputs, RECORD_TRACE)
+
+    try:
+        if USE_ASYNCIO:
+            Runtime(esp).run()
+        else:
+            # физика и кнопки каждые 10 мс, экраны не чаще 30 кадров/с
+            scheduler = Scheduler(esp.step, esp.render, tick_ms=10, fps=30)
+            scheduler.run()
+    finally:
+        esp.close()
+        if RECORD_TRACE:
+            esp.inputs.close()
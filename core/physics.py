@@ -0,0 +1,75 @@
+"""Integer fixed-point helpers for the dashboard simulation.
+
+Fuel is kept in milli-percent (0 to FUEL_FULL) and burn rates in
+micro-percent per second, so a simulation step works on small ints only
+and never allocates a float.
+"""
+import math
+from array import array
+
+FUEL_SCALE = 1000  # milli-percent per percent
+FUEL_FULL = 100 * FUEL_SCALE
+RATE_SCALE = 1000000  # micro-percent per second times ms per milli-percent
+
+
+def wobble_table(ampl, period_ms):
+    """Return idle wobble per millisecond of one period.
+
+    Args:
+        ampl (int): Wobble amplitude in rpm.
+        period_ms (int): Wobble period.
+    Returns:
+        array: floor(sin(2 * pi * t / period_ms) * ampl) for each t.
+    Note:
+        Exact integers (sin 30 deg * 80 = 40) come out of sin() a hair
+        low, so an epsilon keeps them from flooring one rpm short; 1e-3
+        is still seen by the board's single precision floats.
+    """
+    return array('h', [math.floor(math.sin(2 * math.pi * (t / period_ms)) * ampl + 1e-3)
+                       for t in range(period_ms)])
+
+
+def idle_rpm(now, idle, table, noise_ampl, max_rpm):
+    """Return idle rpm at time now (wobble from table plus sawtooth noise).
+
+    Args:
+        now (int): Time in ms.
+        idle (int): Base idle rpm.
+        table (array): wobble_table() for the wobble period.
+        noise_ampl (int): Noise amplitude in rpm.
+        max_rpm (int): Upper clamp.
+    """
+    noise = ((now // 37) % (2 * noise_ampl + 1)) - noise_ampl
+    rpm = idle + table[now % len(table)] + noise
+    if rpm < 0:
+        return 0
+    if rpm > max_rpm:
+        return max_rpm
+    return rpm
+
+
+def speed_rpm(speed, max_speed, idle, max_rpm):
+    """Return rpm linear in speed from idle (speed 0) to max_rpm (max_speed)."""
+    if speed <= 0:
+        return idle
+    if speed >= max_speed:
+        return max_rpm
+    return idle + speed * (max_rpm - idle) // max_speed
+
+
+def burn_rate(rpm, max_rpm, base, top):
+    """Return fuel burn in micro-percent per second at rpm.
+
+    Args:
+        rpm (int): Engine rpm (clamped to 0..max_rpm).
+        max_rpm (int): Rpm at which the burn reaches top.
+        base, top (int): Burn at 0 and max_rpm rpm (micro-percent/s).
+    Note:
+        rate * dt_ms / RATE_SCALE is the milli-percent burned in dt_ms;
+        keep the remainder so 10 ms steps lose nothing to truncation.
+    """
+    if rpm <= 0:
+        return base
+    if rpm >= max_rpm:
+        return top
+    return base + rpm * (top - base) // max_rpm
@@ -0,0 +1,114 @@
+"""Overlap rendering of the two panels on a worker thread.
+
+The ST7789 (SPI2) and ILI9341 (SPI1) have independent buses, so the inner
+panel can be drawn on a second thread while the outer one is drawn on the
+caller's thread.  Uses _thread on the board and on the host (a persistent
+single worker, i.e. a pool of one); without _thread jobs run inline.
+
+Threading is off by default: on the ESP32 port _thread runs under the GIL
+and neither machine.SPI.write nor the st7789 C driver releases it while a
+transfer is on the bus, so the two panels cannot really overlap.
+bench/suite.py times a frame both ways (frame_inline, frame_threaded) to
+check this on a given build before turning it on.
+"""
+import sys
+
+try:
+    import _thread
+except ImportError:
+    _thread = None
+
+WORKER_STACK = 8 * 1024  # bytes, MicroPython only
+
+
+class RenderPipeline(object):
+    """Run one render job on a worker thread while the caller runs another."""
+
+    def __init__(self, threaded=False):
+        """Initialize pipeline.
+
+        Args:
+            threaded (Optional bool): Use a worker thread when _thread is
+                available (default False: every job runs inline).
+        """
+        self.threaded = threaded and _thread is not None
+        self.error = None
+        self._job = None
+        if not self.threaded:
+            return
+        self._start = _thread.allocate_lock()
+        self._done = _thread.allocate_lock()
+        self._start.acquire()
+        if sys.implementation.name == 'micropython':
+            _thread.stack_size(WORKER_STACK)
+        _thread.start_new_thread(self._worker, ())
+
+    def _worker(self):
+        while True:
+            self._start.acquire()
+            if self._job is None:  # close()
+                self._done.release()
+                return
+            try:
+                self._job()
+            except Exception as e:  # re-raised by wait() on the caller
+                self.error = e
+            self._job = None
+            self._done.release()
+
+    def busy(self):
+        """Return True while a submitted job is still running."""
+        return self.threaded and self._done.locked()
+
+    def submit(self, job):
+        """Start job on the worker, waiting for the previous one first.
+
+        Args:
+            job (callable): Render function taking no arguments.
+        """
+        if not self.threaded:
+            job()
+            return
+        self._done.acquire()
+        self._job = job
+        self._start.release()
+
+    def wait(self):
+        """Block until the worker is idle; re-raise its last error."""
+        if self.threaded:
+            self._done.acquire()
+            self._done.release()
+        if self.error is not None:
+            error = self.error
+            self.error = None
+            raise error
+
+    def run(self, main_job, worker_job):
+        """Run worker_job on the worker and main_job here, then join.
+
+        Args:
+            main_job (callable): Job run on the calling thread.
+            worker_job (callable): Job run on the worker thread.
+        """
+        self.submit(worker_job)
+        try:
+            main_job()
+        finally:
+            self.wait()
+
+    def close(self):
+        """Stop the worker thread once it is idle; later jobs run inline.
+
+        Note:
+            The worker never exits on its own, so every threaded pipeline
+            must be closed when its ESP32 is dropped (bench runs, tests).
+            Errors of the last job are not raised; call wait() first.
+        """
+        if not self.threaded:
+            return
+        self._done.acquire()  # idle
+        self._job = None
+        self._start.release()
+        self._done.acquire()  # worker has returned
+        self._done.release()
+        self.threaded = False
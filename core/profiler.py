@@ -0,0 +1,355 @@
+"""SPI traffic profiler with per-widget attribution.
+
+Usage from the REPL while the dashboard runs:
+
+    from profiler import PROFILE
+    PROFILE.enable()
+    PROFILE.report()          # or PROFILE.dump_every(5000) for the UART
+
+Widgets enter a Section around their drawing code; the probes charge every
+SPI write made inside it to that widget.  Sections always run (two
+attribute stores), but the probes are only swapped in by enable() and
+swapped back out by disable(), so a disabled profiler adds nothing to the
+write path and can stay in production firmware.
+"""
+import sys
+import time
+
+# Counter slots of one widget
+CALLS = 0  # Times the section was entered
+TXN = 1  # SPI writes
+CS = 2  # CS assertions
+CMD_BYTES = 3  # Command and argument bytes (overhead)
+PIXEL_BYTES = 4  # WRITE_RAM payload
+SPI_US = 5  # Time inside SPI writes / driver calls
+US = 6  # Time inside the section
+NCOUNTERS = 7
+
+WRITE_RAM = 0x2C
+# One st7789 C driver window: CASET + 4, RASET + 4, RAMWR, each command
+# and its arguments a separate write
+DRIVER_WINDOW_BYTES = 11
+DRIVER_WINDOW_TXN = 5
+
+OTHER = 'other'  # Widget charged for writes outside every section
+
+
+class _Panel(object):
+    """Profiled display: its current widget and counters."""
+
+    def __init__(self, name):
+        self.name = name
+        self.widgets = {}  # widget -> counters
+        self.counters = self.widget(OTHER)
+        self.dc_level = 0
+        self.last_cmd = -1
+        self.attach = None  # callable installing probes, returns undo
+
+    def widget(self, name):
+        counters = self.widgets.get(name)
+        if counters is None:
+            counters = self.widgets[name] = [0] * NCOUNTERS
+        return counters
+
+
+class Section(object):
+    """Context manager charging SPI traffic to one widget of a panel.
+
+    Note:  Create sections once (Profiler.sections) and reuse them;
+    entering one does not allocate.  Sections of one panel may nest but a
+    section must not be re-entered while active.
+    """
+
+    def __init__(self, profiler, panel, name):
+        self.profiler = profiler
+        self.panel = panel
+        self.counters = panel.widget(name)
+        self._prev = None
+        self._t0 = -1
+
+    def __enter__(self):
+        panel = self.panel
+        self._prev = panel.counters
+        panel.counters = self.counters
+        if self.profiler.enabled:
+            self.counters[CALLS] += 1
+            self._t0 = time.ticks_us()
+        return self
+
+    def __exit__(self, *exc):
+        self.panel.counters = self._prev
+        self._prev = None
+        if self._t0 >= 0:
+            self.counters[US] += time.ticks_diff(time.ticks_us(), self._t0)
+            self._t0 = -1
+
+
+class _PinProbe(object):
+    """CS or DC pin that reports levels to its panel."""
+
+    def __init__(self, pin, panel, is_cs):
+        self.pin = pin
+        self.panel = panel
+        self.is_cs = is_cs
+
+    def __call__(self, value=None):
+        if value is None:
+            return self.pin()
+        if self.is_cs:
+            if not value:
+                self.panel.counters[CS] += 1
+        else:
+            self.panel.dc_level = value
+        self.pin(value)
+
+    def value(self, value=None):
+        return self(value)
+
+    def __getattr__(self, name):
+        return getattr(self.pin, name)
+
+
+class _SpiProbe(object):
+    """SPI bus that charges writes to the panel's current widget."""
+
+    def __init__(self, spi, panel):
+        self.spi = spi
+        self.panel = panel
+
+    def write(self, data):
+        panel = self.panel
+        c = panel.counters
+        c[TXN] += 1
+        if panel.dc_level:
+            if panel.last_cmd == WRITE_RAM:
+                c[PIXEL_BYTES] += len(data)
+            else:
+                c[CMD_BYTES] += len(data)
+        else:
+            panel.last_cmd = data[0]
+            c[CMD_BYTES] += len(data)
+        t0 = time.ticks_us()
+        self.spi.write(data)
+        c[SPI_US] += time.ticks_diff(time.ticks_us(), t0)
+
+    def __getattr__(self, name):
+        return getattr(self.spi, name)
+
+
+class _DriverProbe(object):
+    """st7789 C driver wrapper estimating the SPI traffic of each call.
+
+    Note:  The C driver writes the bus itself, so bytes and writes are
+    estimated: one window (DRIVER_WINDOW_BYTES, DRIVER_WINDOW_TXN, one CS
+    assertion) plus the pixel payload per primitive.  Times are measured.
+    """
+
+    def __init__(self, driver, panel):
+        self.driver = driver
+        self.panel = panel
+
+    def _charge(self, windows, pixel_bytes, t0):
+        c = self.panel.counters
+        c[TXN] += windows * (DRIVER_WINDOW_TXN + 1)
+        c[CS] += windows
+        c[CMD_BYTES] += windows * DRIVER_WINDOW_BYTES
+        c[PIXEL_BYTES] += pixel_bytes
+        c[SPI_US] += time.ticks_diff(time.ticks_us(), t0)
+
+    def fill(self, color):
+        t0 = time.ticks_us()
+        d = self.driver
+        d.fill(color)
+        self._charge(1, d.width() * d.height() * 2, t0)
+
+    def fill_rect(self, x, y, w, h, color):
+        t0 = time.ticks_us()
+        self.driver.fill_rect(x, y, w, h, color)
+        self._charge(1, w * h * 2, t0)
+
+    def hline(self, x, y, w, color):
+        t0 = time.ticks_us()
+        self.driver.hline(x, y, w, color)
+        self._charge(1, w * 2, t0)
+
+    def vline(self, x, y, h, color):
+        t0 = time.ticks_us()
+        self.driver.vline(x, y, h, color)
+        self._charge(1, h * 2, t0)
+
+    def pixel(self, x, y, color):
+        t0 = time.ticks_us()
+        self.driver.pixel(x, y, color)
+        self._charge(1, 2, t0)
+
+    def rect(self, x, y, w, h, color):
+        t0 = time.ticks_us()
+        self.driver.rect(x, y, w, h, color)
+        self._charge(4, (w + h) * 4, t0)
+
+    def blit_buffer(self, buf, x, y, w, h):
+        t0 = time.ticks_us()
+        self.driver.blit_buffer(buf, x, y, w, h)
+        self._charge(1, len(buf), t0)
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+
+class Profiler(object):
+    """Per-panel, per-widget SPI counters and wall time."""
+
+    def __init__(self):
+        self.enabled = False
+        self.panels = {}
+        self._undo = []
+        self.dump_ms = 0
+        self.dump_stream = None
+        self._last_dump = 0
+
+    def _panel(self, name):
+        panel = self.panels.get(name)
+        if panel is None:
+            panel = self.panels[name] = _Panel(name)
+        return panel
+
+    def sections(self, panel, names):
+        """Return {name: Section} for widgets of a panel.
+
+        Args:
+            panel (string): Panel name, e.g. "outer".
+            names (iterable): Widget names.
+        """
+        p = self._panel(panel)
+        return dict((name, Section(self, p, name)) for name in names)
+
+    def attach_bus(self, panel, display):
+        """Profile an ili9341.Display through its spi, cs and dc attributes.
+
+        Args:
+            panel (string): Panel name.
+            display (Display): Display writing the bus from Python.
+        """
+        p = self._panel(panel)
+
+        def attach():
+            spi, cs, dc = display.spi, display.cs, display.dc
+            display.spi = _SpiProbe(spi, p)
+            display.cs = _PinProbe(cs, p, True)
+            display.dc = _PinProbe(dc, p, False)
+
+            def undo():
+                display.spi, display.cs, display.dc = spi, cs, dc
+            return undo
+        self._register(p, attach)
+
+    def attach_driver(self, panel, owner, attr='display'):
+        """Profile a st7789 driver held in owner.<attr>.
+
+        Args:
+            panel (string): Panel name.
+            owner (object): Object whose attribute holds the driver.
+            attr (Optional string): Attribute name (default 'display').
+        """
+        p = self._panel(panel)
+
+        def attach():
+            driver = getattr(owner, attr)
+            setattr(owner, attr, _DriverProbe(driver, p))
+
+            def undo():
+                setattr(owner, attr, driver)
+            return undo
+        self._register(p, attach)
+
+    def _register(self, panel, attach):
+        panel.attach = attach
+        if self.enabled:
+            self._undo.append(attach())
+
+    def enable(self):
+        """Swap the probes in and start counting."""
+        if self.enabled:
+            return
+        for panel in self.panels.values():
+            if panel.attach is not None:
+                self._undo.append(panel.attach())
+        self._last_dump = time.ticks_ms()
+        self.enabled = True
+
+    def disable(self):
+        """Restore the original buses and drivers; counters are kept."""
+        self.enabled = False
+        while self._undo:
+            self._undo.pop()()
+
+    def reset(self):
+        """Zero all counters."""
+        for panel in self.panels.values():
+            for counters in panel.widgets.values():
+                for i in range(NCOUNTERS):
+                    counters[i] = 0
+
+    def stats(self):
+        """Return {(panel, widget): {counter: value}} for widgets with traffic."""
+        out = {}
+        for panel in self.panels.values():
+            for name, c in panel.widgets.items():
+                if c[CALLS] or c[TXN]:
+                    out[(panel.name, name)] = {
+                        'calls': c[CALLS], 'txn': c[TXN], 'cs': c[CS],
+                        'cmd_bytes': c[CMD_BYTES],
+                        'pixel_bytes': c[PIXEL_BYTES],
+                        'spi_us': c[SPI_US], 'us': c[US],
+                    }
+        return out
+
+    def report(self, stream=None):
+        """Write a table of the counters, busiest widget first.
+
+        Args:
+            stream (Optional stream): Object with write(), e.g. a
+                machine.UART (default sys.stdout).
+        """
+        stream = stream or sys.stdout
+        rows = sorted(self.stats().items(),
+                      key=lambda kv: -(kv[1]['cmd_bytes'] + kv[1]['pixel_bytes']))
+        stream.write('{0:<18}{1:>7}{2:>8}{3:>7}{4:>9}{5:>10}{6:>9}{7:>9}\n'.format(
+            'widget', 'calls', 'txn', 'cs', 'cmd B', 'pixel B', 'spi ms', 'ms'))
+        total = [0] * 4
+        for (panel, name), s in rows:
+            stream.write('{0:<18}{1:>7}{2:>8}{3:>7}{4:>9}{5:>10}{6:>9}{7:>9}\n'.format(
+                panel + '.' + name, s['calls'], s['txn'], s['cs'],
+                s['cmd_bytes'], s['pixel_bytes'],
+                s['spi_us'] // 1000, s['us'] // 1000))
+            total[0] += s['txn']
+            total[1] += s['cs']
+            total[2] += s['cmd_bytes']
+            total[3] += s['pixel_bytes']
+        nbytes = total[2] + total[3]
+        stream.write('total {0} txn, {1} cs, {2} bytes, {3}% command overhead\n'.format(
+            total[0], total[1], nbytes, total[2] * 100 // nbytes if nbytes else 0))
+
+    def dump_every(self, ms, stream=None):
+        """Report every ms milliseconds from poll() (0 stops).
+
+        Args:
+            ms (int): Interval in ms.
+            stream (Optional stream): Destination (default sys.stdout,
+                the REPL UART on the board).
+        """
+        self.dump_ms = ms
+        self.dump_stream = stream
+        self._last_dump = time.ticks_ms()
+
+    def poll(self):
+        """Dump the report if its interval is due; call from the main loop."""
+        if not self.dump_ms:
+            return
+        now = time.ticks_ms()
+        if time.ticks_diff(now, self._last_dump) >= self.dump_ms:
+            self._last_dump = now
+            self.report(self.dump_stream)
+
+
+PROFILE = Profiler()
@@ -0,0 +1,101 @@
+"""Numeric gauge readouts that only redraw the digits that changed."""
+from framebuf import FrameBuffer, RGB565  # type: ignore
+
+GLYPH_BYTES = 128  # 8 x 8 RGB565 glyph
+
+
+class Readout(object):
+    """Fixed-format number drawn with rotate=90 8x8 glyphs.
+
+    Note:
+        The rendered string is kept in an RGB565 buffer.  On update only
+        the character cells that differ from the previous string are
+        copied from the display glyph cache and sent, as one block write
+        spanning the first to the last changed cell.  Cells stack
+        vertically (rotate=90), so that span is contiguous in the buffer.
+    """
+
+    def __init__(self, display, cx, cy, fmt, color, background=0):
+        """Initialize readout.
+
+        Args:
+            display (Display): ILI9341 display with a glyph cache.
+            cx, cy (int): Position the text is centered on (as in
+                OuterDisplay.draw_number_center).
+            fmt (string): Format applied to int(value), e.g. "{:3d}".
+            color (int): RGB565 text color.
+            background (int): RGB565 background color.
+        """
+        self.display = display
+        self.cx = cx
+        self.cy = cy
+        self.fmt = fmt
+        self.color = color
+        self.background = background
+        self.text = None
+        self.x = 0
+        self.y = 0
+        self.buf = None
+        self.mv = None
+        self.fbuf = None
+
+    def _layout(self, n):
+        """Size buffer and position for an n character string."""
+        if self.buf is not None and len(self.buf) == n * GLYPH_BYTES:
+            return
+        if self.text is not None:
+            # Length changed: blank the old cells first
+            self.display.fill_rectangle(self.x, self.y, 8,
+                                        len(self.text) * 8, self.background)
+        self.x = self.cx - (n * 8) // 2
+        self.y = self.cy - 4
+        self.buf = bytearray(n * GLYPH_BYTES)
+        self.mv = memoryview(self.buf)
+        self.fbuf = FrameBuffer(self.buf, 8, n * 8, RGB565)
+        self.text = None
+
+    def draw(self, value):
+        """Show value, sending only the changed character cells."""
+        text = self.fmt.format(int(value))
+        prev = self.text
+        if prev == text:
+            return
+        n = len(text)
+        self._layout(n)
+        prev = self.text
+
+        if prev is None:
+            first = 0
+            last = n - 1
+        else:
+            first = 0
+            while text[first] == prev[first]:
+                first += 1
+            last = n - 1
+            while text[last] == prev[last]:
+                last -= 1
+
+        glyphs = self.display.glyphs
+        mv = self.mv
+        for i in range(first, last + 1):
+            mv[i * GLYPH_BYTES:(i + 1) * GLYPH_BYTES] = glyphs.get(
+                text[i], 90, self.color, self.background)
+
+        self.display.block(self.x, self.y + first * 8,
+                           self.x + 7, self.y + last * 8 + 7,
+                           mv[first * GLYPH_BYTES:(last + 1) * GLYPH_BYTES])
+        self.text = text
+
+    def invalidate(self):
+        """Force a full redraw on the next draw()."""
+        self.text = None
+
+    def composite(self, tile):
+        """Copy the current readout into a tile drawn over it.
+
+        Args:
+            tile (Tile): Tile started with Tile.begin().
+        """
+        if self.text is None:
+            return
+        tile.fbuf.blit(self.fbuf, self.x - tile.x, self.y - tile.y)
@@ -0,0 +1,147 @@
+"""Cooperative asyncio runtime: one task per dashboard subsystem.
+
+Uses uasyncio on the board and CPython asyncio on the host.
+"""
+
+try:
+    import uasyncio as asyncio  # type: ignore
+except ImportError:
+    import asyncio
+
+if hasattr(asyncio, 'sleep_ms'):
+    sleep_ms = asyncio.sleep_ms
+else:
+    def sleep_ms(ms):
+        return asyncio.sleep(ms / 1000)
+
+
+class Runtime(object):
+    """Run ESP32 subsystems as tasks with their own periods.
+
+    Note:
+        Inputs (buttons, refuel, throttle, fuel burn) are sampled every
+        INPUT_MS.  Decay, buzzer and idle wobble wake only when their
+        interval is due, the blinker sleeps on an event while no turn
+        button is held, and each display has a renderer task that waits
+        for a "state changed" event instead of polling; the outer one also
+        wakes once per animation frame while a needle is moving.  The inner
+        panel goes through the RenderPipeline: inline by default, or on
+        its worker thread with ESP32.PIPELINE_THREADED, in which case the
+        task waits for the worker without blocking the loop.
+    """
+
+    INPUT_MS = 10
+
+    def __init__(self, esp):
+        """Initialize runtime.
+
+        Args:
+            esp (ESP32): Dashboard whose subsystem methods are scheduled.
+        """
+        self.esp = esp
+        self.outer_changed = asyncio.Event()
+        self.inner_changed = asyncio.Event()
+        self.turn_changed = asyncio.Event()
+
+    def _commit(self, changed):
+        esp = self.esp
+        esp.commit(changed)
+        if esp.dirty:
+            esp.dirty = False
+            self.outer_changed.set()
+            self.inner_changed.set()
+
+    def _turn_outputs(self):
+        esp = self.esp
+        left_on = esp.left_on
+        right_on = esp.right_on
+        esp.turn_outputs()
+        if esp.left_on != left_on or esp.right_on != right_on:
+            self.outer_changed.set()
+
+    async def input_task(self):
+        esp = self.esp
+        while True:
+            now = esp.ticks_ms()
+            was_turning = esp.left_pressed or esp.right_pressed
+            esp.read_buttons(now)
+            if (esp.left_pressed or esp.right_pressed) != was_turning:
+                self.turn_changed.set()
+
+            changed = esp.pedals(now)
+            if esp.burn_fuel(now):
+                changed = True
+            self._turn_outputs()
+            self._commit(changed)
+
+            await sleep_ms(self.INPUT_MS)
+
+    async def periodic_task(self, fn, timer):
+        """Call fn(now) whenever its timer is due.
+
+        Args:
+            fn (callable): ESP32 subsystem taking now in ms.
+            timer (Periodic): Timer the subsystem consumes.
+        """
+        esp = self.esp
+        while True:
+            self._commit(fn(esp.ticks_ms()))
+            due = timer.due_in(esp.ticks_ms())
+            await sleep_ms(due if due > 0 else timer.interval)
+
+    async def blink_task(self):
+        esp = self.esp
+        while True:
+            esp.blink(esp.ticks_ms())
+            self._turn_outputs()
+            if esp.left_pressed or esp.right_pressed:
+                await sleep_ms(esp.BLINK_INTERVAL_MS)
+            else:
+                self.turn_changed.clear()
+                await self.turn_changed.wait()
+
+    async def outer_task(self):
+        esp = self.esp
+        outer = esp.outer_display
+        while True:
+            if outer.animating():
+                # Needles still moving: wait for the next animation frame
+                if not self.outer_changed.is_set():
+                    await sleep_ms(outer.frame_wait(esp.ticks_ms()))
+            else:
+                await self.outer_changed.wait()
+            self.outer_changed.clear()
+            outer.draw_turn_signals(left_on=esp.left_on, right_on=esp.right_on)
+            await sleep_ms(0)
+            outer.update(esp.curr_speed, esp.curr_rpm, esp.max_speed, esp.max_rpm,
+                         esp.ticks_ms())
+
+    async def inner_task(self):
+        esp = self.esp
+        pipeline = esp.pipeline
+        while True:
+            await self.inner_changed.wait()
+            # Never block the loop on the worker: wait for it cooperatively
+            while pipeline.busy():
+                await sleep_ms(1)
+            pipeline.wait()  # idle by now; re-raises a failed frame
+            self.inner_changed.clear()
+            esp.frame_fuel_mp = esp.curr_fuel_mp
+            pipeline.submit(esp.render_inner)
+
+    async def main(self):
+        esp = self.esp
+        tasks = (
+            self.input_task(),
+            self.periodic_task(esp.decay, esp.decay_timer),
+            self.periodic_task(esp.buzz, esp.buzzer_timer),
+            self.periodic_task(esp.idle, esp.idle_timer),
+            self.blink_task(),
+            self.outer_task(),
+            self.inner_task(),
+        )
+        await asyncio.gather(*[asyncio.create_task(t) for t in tasks])
+
+    def run(self):
+        """Run all tasks forever."""
+        asyncio.run(self.main())
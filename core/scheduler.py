@@ -0,0 +1,124 @@
+"""Fixed-rate simulation ticks decoupled from display frames."""
+import time
+
+
+class Scheduler(object):
+    """Run a simulation step at a fixed rate and render at a target FPS.
+
+    Note:
+        Ticks catch up after a stall (up to max_catchup at once), so
+        physics sees every interval.  Frames do not: a late frame is drawn
+        once with the newest state and the missed frame slots are counted
+        as skipped, so all state changes between two frames are coalesced
+        into one redraw.
+    """
+
+    def __init__(self, tick, render, tick_ms=10, fps=30, max_catchup=10,
+                 ticks_ms=None, ticks_us=None, sleep_ms=None):
+        """Initialize scheduler.
+
+        Args:
+            tick (callable): Input/physics step, called every tick_ms.
+            render (callable): Draws the latest state, called once per frame.
+            tick_ms (Optional int): Simulation period in ms (default 10).
+            fps (Optional int): Target frames per second (default 30).
+            max_catchup (Optional int): Most ticks run back to back after a
+                stall before the tick clock is resynchronised.
+            ticks_ms, ticks_us, sleep_ms (Optional callable): Clock and
+                sleep functions; default to the time module (inject fakes
+                for host-side simulation).
+        """
+        self.tick = tick
+        self.render = render
+        self.tick_ms = tick_ms
+        self.frame_ms = max(1, 1000 // fps)
+        self.max_catchup = max_catchup
+        self._ticks_ms = ticks_ms or time.ticks_ms
+        self._ticks_us = ticks_us or time.ticks_us
+        self._sleep_ms = sleep_ms or time.sleep_ms
+        now = self._ticks_ms()
+        self.next_tick_ms = now
+        self.next_frame_ms = now
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Clear tick and frame timing statistics."""
+        self.ticks = 0
+        self.frames = 0
+        self.skipped_frames = 0
+        self.dropped_ticks = 0
+        self.tick_us = 0
+        self.tick_us_max = 0
+        self.tick_us_total = 0
+        self.frame_us = 0
+        self.frame_us_max = 0
+        self.frame_us_total = 0
+
+    def stats(self):
+        """Return timing statistics as a dict (times in microseconds)."""
+        return {
+            'ticks': self.ticks,
+            'frames': self.frames,
+            'skipped_frames': self.skipped_frames,
+            'dropped_ticks': self.dropped_ticks,
+            'tick_us': self.tick_us,
+            'tick_us_max': self.tick_us_max,
+            'tick_us_avg': self.tick_us_total // self.ticks if self.ticks else 0,
+            'frame_us': self.frame_us,
+            'frame_us_max': self.frame_us_max,
+            'frame_us_avg': (self.frame_us_total // self.frames
+                             if self.frames else 0),
+        }
+
+    def run_once(self):
+        """Run every due tick and at most one frame.
+
+        Returns:
+            int: Milliseconds until the next tick or frame is due.
+        """
+        ticks_ms = self._ticks_ms
+        ticks_us = self._ticks_us
+
+        n = 0
+        while time.ticks_diff(ticks_ms(), self.next_tick_ms) >= 0:
+            if n >= self.max_catchup:
+                # Too far behind: drop the backlog instead of spiralling
+                behind = time.ticks_diff(ticks_ms(), self.next_tick_ms)
+                self.dropped_ticks += behind // self.tick_ms + 1
+                self.next_tick_ms = time.ticks_add(ticks_ms(), self.tick_ms)
+                break
+            start = ticks_us()
+            self.tick()
+            self.tick_us = time.ticks_diff(ticks_us(), start)
+            self.tick_us_total += self.tick_us
+            if self.tick_us > self.tick_us_max:
+                self.tick_us_max = self.tick_us
+            self.ticks += 1
+            self.next_tick_ms = time.ticks_add(self.next_tick_ms, self.tick_ms)
+            n += 1
+
+        late = time.ticks_diff(ticks_ms(), self.next_frame_ms)
+        if late >= 0:
+            start = ticks_us()
+            self.render()
+            self.frame_us = time.ticks_diff(ticks_us(), start)
+            self.frame_us_total += self.frame_us
+            if self.frame_us > self.frame_us_max:
+                self.frame_us_max = self.frame_us
+            self.frames += 1
+            missed = late // self.frame_ms
+            self.skipped_frames += missed
+            self.next_frame_ms = time.ticks_add(
+                self.next_frame_ms, (missed + 1) * self.frame_ms)
+
+        now = ticks_ms()
+        wait = min(time.ticks_diff(self.next_tick_ms, now),
+                   time.ticks_diff(self.next_frame_ms, now))
+        return wait if wait > 0 else 0
+
+    def run(self):
+        """Run forever, sleeping between ticks and frames."""
+        while True:
+            wait = self.run_once()
+            if wait:
+                self._sleep_ms(wait)
@@ -0,0 +1,167 @@
+"""Palette-indexed, optionally run-length encoded sprites streamed to the ILI9341.
+
+Built on the host by tools/pack_sprite.py.  Layout (little endian header,
+big-endian RGB565 palette):
+
+    header   '<4sBBHHH'  magic b'PSPR', bpp, flags, width, height, colors
+    palette  colors x '>H'
+    data     raw: rows of palette indices packed at bpp bits in the
+             FrameBuffer layout (MONO_HLSB, GS2_HMSB, GS4_HMSB or GS8),
+             each row padded to a byte;
+             RLE (flags & FLAG_RLE): a stream of tokens over all pixels,
+             c >= 0x80: (c & 0x7F) + 1 copies of the next index byte,
+             c < 0x80: c + 1 literal index bytes.
+"""
+import struct
+from framebuf import FrameBuffer, MONO_HLSB, GS2_HMSB, GS4_HMSB, GS8, RGB565  # type: ignore
+
+MAGIC = b'PSPR'
+HEADER = '<4sBBHHH'
+HEADER_SIZE = struct.calcsize(HEADER)
+FLAG_RLE = 0x01
+FORMATS = {1: MONO_HLSB, 2: GS2_HMSB, 4: GS4_HMSB, 8: GS8}
+READ_CHUNK = 512  # Bytes of RLE data read at a time
+
+
+def row_bytes(w, bpp):
+    """Return bytes per packed row of w pixels at bpp bits."""
+    return (w * bpp + 7) // 8
+
+
+class _Stream(object):
+    """Byte reader over a file, refilled in READ_CHUNK reads."""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = bytearray(READ_CHUNK)
+        self.pos = 0
+        self.end = 0
+
+    def byte(self):
+        if self.pos >= self.end:
+            self.end = self.f.readinto(self.buf)
+            self.pos = 0
+            if not self.end:
+                raise ValueError('Sprite data truncated.')
+        b = self.buf[self.pos]
+        self.pos += 1
+        return b
+
+
+class PackedSprite(object):
+    """Compressed sprite decoded strip by strip into Display.strips.
+
+    Note:  Only the header and palette are kept in RAM.  Pixels are read
+    from flash and expanded one strip at a time, so a full-panel image
+    needs no more memory than the display's strip buffer.  Raw sprites
+    expand with one FrameBuffer.blit per strip through the palette; RLE
+    sprites fill runs with FrameBuffer.hline.
+    """
+
+    def __init__(self, path):
+        """Initialize sprite.
+
+        Args:
+            path (string): Sprite file path.
+        Raises:
+            ValueError: If the file is not a packed sprite.
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+            magic, bpp, flags, w, h, n = struct.unpack(HEADER, header)
+            if magic != MAGIC or bpp not in FORMATS:
+                raise ValueError('{0} is not a packed sprite.'.format(path))
+            palette = f.read(n * 2)
+        self.bpp = bpp
+        self.rle = bool(flags & FLAG_RLE)
+        self.width = w
+        self.height = h
+        self.data_offset = HEADER_SIZE + n * 2
+        # Big-endian colors read as little-endian framebuf pixels are
+        # already byte swapped, so the palette is used as stored
+        self.colors = [palette[i + 1] << 8 | palette[i]
+                       for i in range(0, n * 2, 2)]
+        self.palette_buf = bytearray(palette)
+        self.palette = FrameBuffer(self.palette_buf, max(n, 1), 1, RGB565)
+
+    def draw(self, display, x, y):
+        """Decode the sprite to display with its top left corner at x, y.
+
+        Args:
+            display (Display): ILI9341 display with a strip buffer.
+            x, y (int): Top left corner.
+        """
+        w = self.width
+        h = self.height
+        if display.is_off_grid(x, y, x + w - 1, y + h - 1):
+            return
+        band = min(h, display.strips.pixels // w)
+        with open(self.path, 'rb') as f:
+            f.seek(self.data_offset)
+            if self.rle:
+                self._draw_rle(f, display, x, y, band)
+            else:
+                self._draw_raw(f, display, x, y, band)
+
+    def _draw_raw(self, f, display, x, y, band):
+        w = self.width
+        stride = row_bytes(w, self.bpp)
+        fmt = FORMATS[self.bpp]
+        src_buf = bytearray(band * stride)
+        src_mv = memoryview(src_buf)
+        top = 0
+        while top < self.height:
+            n = min(band, self.height - top)
+            out = display.strips.next()[:n * w * 2]
+            f.readinto(src_mv[:n * stride])
+            src = FrameBuffer(src_buf, w, n, fmt)
+            FrameBuffer(out, w, n, RGB565).blit(src, 0, 0, -1, self.palette)
+            display.block(x, y + top, x + w - 1, y + top + n - 1, out)
+            top += n
+
+    def _draw_rle(self, f, display, x, y, band):
+        w = self.width
+        h = self.height
+        colors = self.colors
+        stream = _Stream(f)
+        top = 0
+        n = min(band, h)
+        out = display.strips.next()[:n * w * 2]
+        dst = FrameBuffer(out, w, n, RGB565)
+        col = 0
+        row = 0
+        while top < h:
+            c = stream.byte()
+            if c & 0x80:
+                count = (c & 0x7F) + 1
+                literal = False
+                color = colors[stream.byte()]
+            else:
+                count = c + 1
+                literal = True
+            while count:
+                if literal:
+                    color = colors[stream.byte()]
+                    k = 1
+                else:
+                    k = min(count, w - col)
+                dst.hline(col, row, k, color)
+                col += k
+                count -= k
+                if col < w:
+                    continue
+                col = 0
+                row += 1
+                if row < n:
+                    continue
+                display.block(x, y + top, x + w - 1, y + top + n - 1, out)
+                top += n
+                row = 0
+                if top >= h:
+                    if count:
+                        raise ValueError('Sprite data overruns image.')
+                    break
+                n = min(band, h - top)
+                out = display.strips.next()[:n * w * 2]
+                dst = FrameBuffer(out, w, n, RGB565)
@@ -0,0 +1,112 @@
+"""Off-screen RGB565 tiles pushed to the panel with a single block write."""
+from framebuf import FrameBuffer, RGB565  # type: ignore
+
+
+def swap565(color):
+    """Return RGB565 color with bytes swapped for framebuf endianness.
+
+    Args:
+        color (int): RGB565 color value.
+    """
+    return ((color & 0xFF) << 8) | ((color & 0xFF00) >> 8)
+
+
+def rect_union(a, b):
+    """Return bounding box (x0, y0, x1, y1) covering boxes a and b."""
+    return (min(a[0], b[0]), min(a[1], b[1]),
+            max(a[2], b[2]), max(a[3], b[3]))
+
+
+def rect_area(r):
+    """Return pixel count of inclusive box (x0, y0, x1, y1)."""
+    return (r[2] - r[0] + 1) * (r[3] - r[1] + 1)
+
+
+def rect_overlaps(a, b):
+    """Return True if inclusive boxes a and b share at least one pixel."""
+    return not (a[2] < b[0] or b[2] < a[0] or a[3] < b[1] or b[3] < a[1])
+
+
+class Tile(object):
+    """Reusable off-screen RGB565 buffer for a small dirty rectangle.
+
+    Note:
+        The buffer is allocated once.  Each begin() only creates a new
+        FrameBuffer view over the first w * h pixels of it, so drawing a
+        dirty rectangle costs a single Display.block transaction instead
+        of one transaction per pixel.
+    """
+
+    def __init__(self, display, max_pixels):
+        """Initialize tile.
+
+        Args:
+            display (Display): ILI9341 display the tile is pushed to.
+            max_pixels (int): Largest w * h the tile will ever hold.
+        """
+        self.display = display
+        self.max_pixels = max_pixels
+        self.buf = bytearray(max_pixels * 2)
+        self.mv = memoryview(self.buf)
+        self.fbuf = None
+        self.x = 0
+        self.y = 0
+        self.w = 0
+        self.h = 0
+
+    def begin(self, x0, y0, x1, y1, background=0):
+        """Start drawing a dirty rectangle.
+
+        Args:
+            x0, y0 (int): Top left corner (inclusive, screen coordinates).
+            x1, y1 (int): Bottom right corner (inclusive, screen coordinates).
+            background (int): RGB565 color the tile is cleared to.
+        Returns:
+            FrameBuffer: Tile surface or None if the box is off screen.
+        """
+        d = self.display
+        if x0 < 0:
+            x0 = 0
+        if y0 < 0:
+            y0 = 0
+        if x1 >= d.width:
+            x1 = d.width - 1
+        if y1 >= d.height:
+            y1 = d.height - 1
+        w = x1 - x0 + 1
+        h = y1 - y0 + 1
+        if w <= 0 or h <= 0:
+            self.fbuf = None
+            return None
+        if w * h > self.max_pixels:
+            raise ValueError('Tile {0}x{1} exceeds {2} pixels.'.format(
+                w, h, self.max_pixels))
+        self.x = x0
+        self.y = y0
+        self.w = w
+        self.h = h
+        self.fbuf = FrameBuffer(self.mv, w, h, RGB565)
+        self.fbuf.fill(swap565(background))
+        return self.fbuf
+
+    def line(self, x1, y1, x2, y2, color):
+        """Draw a line in screen coordinates clipped to the tile."""
+        self.fbuf.line(x1 - self.x, y1 - self.y, x2 - self.x, y2 - self.y,
+                       swap565(color))
+
+    def pixel(self, x, y, color):
+        """Draw a pixel in screen coordinates clipped to the tile."""
+        self.fbuf.pixel(x - self.x, y - self.y, swap565(color))
+
+    def box(self):
+        """Return current tile bounds as inclusive (x0, y0, x1, y1)."""
+        return (self.x, self.y, self.x + self.w - 1, self.y + self.h - 1)
+
+    def push(self):
+        """Write the tile to the display in one block transfer."""
+        if self.fbuf is None:
+            return
+        self.display.block(self.x, self.y,
+                           self.x + self.w - 1, self.y + self.h - 1,
+                           self.mv[:self.w * self.h * 2])
+        self.fbuf = None
@@ -0,0 +1,49 @@
+"""Periodic timers that catch up on every interval missed during a stall."""
+import time
+
+
+class Periodic(object):
+    """Fixed-interval timer counting whole intervals elapsed.
+
+    Note:  elapsed() advances the reference by exactly the intervals it
+    reports, never to now, so a 450 ms stall of a 200 ms timer reports 2
+    and keeps the remaining 50 ms for the next call.  Catching up is one
+    division, whatever the stall.  arm() makes the next call fire once at
+    once and restart the phase there, for behaviour that should react
+    immediately when it becomes active (blinker, buzzer, idle wobble).
+    """
+
+    def __init__(self, interval_ms, now):
+        """Initialize timer.
+
+        Args:
+            interval_ms (int): Period in ms.
+            now (int): Start of the first interval (ticks_ms).
+        """
+        self.interval = interval_ms
+        self.last = now
+        self.armed = False
+
+    def elapsed(self, now):
+        """Return intervals completed since the last call and consume them."""
+        if self.armed:
+            self.armed = False
+            self.last = now
+            return 1
+        d = time.ticks_diff(now, self.last)
+        if d < self.interval:
+            return 0
+        n = d // self.interval
+        self.last = time.ticks_add(self.last, n * self.interval)
+        return n
+
+    def arm(self):
+        """Fire on the next elapsed() call and start the phase there."""
+        self.armed = True
+
+    def due_in(self, now):
+        """Return ms until the next interval completes (0 if overdue)."""
+        if self.armed:
+            return 0
+        d = self.interval - time.ticks_diff(now, self.last)
+        return d if d > 0 else 0
@@ -0,0 +1,83 @@
+"""Headless host simulator for the dashboard.
+
+Puts stand-ins for the MicroPython modules (machine, framebuf, micropython,
+st7789) and core/ on sys.path and replaces the MicroPython time functions,
+so core/main.py runs unmodified under CPython:
+
+    import sim
+    clock = sim.install()
+    import main, config
+    panel = sim.ILI9341Panel(config.spi_ili, dc=15)
+    outer = main.OuterDisplay(200, 8000)
+
+ILI9341Panel decodes the command stream written to a fake SPI bus into an
+RGB565 framebuffer; the st7789 stand-in draws straight into its own.
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORE = os.path.join(ROOT, 'core')
+STUBS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stubs')
+
+
+class Clock(object):
+    """Millisecond clock for time.ticks_ms and friends.
+
+    Note:  Virtual time (the default) only moves on sleep_ms/advance, so
+    runs are deterministic and as fast as the host allows.  Real time
+    follows time.monotonic() for code that sleeps through asyncio.
+    """
+
+    def __init__(self, real=False):
+        self.real = real
+        self.ms = 0
+        self._t0 = time.monotonic()
+
+    def ticks_ms(self):
+        if self.real:
+            return int((time.monotonic() - self._t0) * 1000)
+        return self.ms
+
+    def ticks_us(self):
+        if self.real:
+            return int((time.monotonic() - self._t0) * 1000000)
+        return self.ms * 1000
+
+    def advance(self, ms):
+        """Move virtual time forward by ms."""
+        self.ms += ms
+
+    def sleep_ms(self, ms):
+        if self.real:
+            time.sleep(ms / 1000)
+        else:
+            self.ms += ms
+
+
+def install(real_time=False):
+    """Make MicroPython code importable on the host.
+
+    Args:
+        real_time (Optional bool): Follow the wall clock instead of
+            virtual time (default False).
+    Returns:
+        Clock: The clock behind time.ticks_ms.
+    """
+    for path in (CORE, STUBS):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    clock = Clock(real_time)
+    time.ticks_ms = clock.ticks_ms
+    time.ticks_us = clock.ticks_us
+    time.ticks_diff = lambda a, b: a - b
+    time.ticks_add = lambda a, b: a + b
+    time.sleep_ms = clock.sleep_ms
+    time.sleep_us = lambda us: None
+    if not real_time:
+        time.sleep = lambda s: clock.advance(int(s * 1000))
+    return clock
+
+
+from sim.panel import ILI9341Panel  # noqa: E402,F401
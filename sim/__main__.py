@@ -0,0 +1,118 @@
+"""Run a scripted drive through the dashboard on the host.
+
+    python -m sim               # print SPI traffic and the panel digest
+    python -m sim --ascii       # also dump the speed dial as text
+    python -m sim --profile     # SPI traffic per widget during the drive
+    python -m sim --jagged      # Bresenham needles instead of anti-aliased
+    python -m sim --trace drive # replay the idle/throttle/coast/refuel trace
+    python -m sim --trace t.bin # replay a trace recorded on the board
+    python -m sim --save-trace t.bin  # write the built-in drive trace
+
+Twelve seconds of refuelling (gas button held), then three seconds of
+throttle taps.  The digest is stable between runs, so a refactor that
+should not change pixels can be checked against it.
+"""
+import argparse
+import os
+import time
+
+import sim
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--ascii', action='store_true',
+                        help='print the speed dial as text')
+    parser.add_argument('--profile', action='store_true',
+                        help='report SPI traffic per widget for the drive')
+    parser.add_argument('--jagged', action='store_true',
+                        help='draw needles without anti-aliasing')
+    parser.add_argument('--trace',
+                        help="replay a button trace ('drive' for the built-in one)")
+    parser.add_argument('--save-trace', help='write the built-in trace here')
+    args = parser.parse_args(argv)
+
+    cwd = os.getcwd()
+    os.chdir(sim.CORE)  # icons.bin and friends are opened relative to core
+    clock = sim.install()
+    if args.save_trace:
+        from sim.replay import drive_scenario
+        with open(os.path.join(cwd, args.save_trace), 'wb') as f:
+            f.write(drive_scenario())
+        return
+    import main as dashboard  # type: ignore
+    dashboard.OuterDisplay.NEEDLE_AA = not args.jagged
+    if args.trace:
+        replay_trace(args, clock, cwd)
+        return
+    import config  # type: ignore
+    from machine import Pin  # type: ignore
+    from profiler import PROFILE  # type: ignore
+
+    panel = sim.ILI9341Panel(config.spi_ili, dc=15)
+    outer = dashboard.OuterDisplay(max_speed=200, max_rpm=8000)
+    esp = dashboard.ESP32(outer_display=outer, max_speed=200, max_rpm=8000,
+                          idle_rpm=800)
+    print('boot      {0:>7} bytes {1:>5} txn'.format(panel.nbytes, panel.txn))
+
+    Pin.drive(32, 0)
+    for _ in range(1200):
+        esp.process()
+        clock.advance(10)
+    Pin.drive(32, 1)
+    print('refuel    fuel {0} mp'.format(esp.curr_fuel_mp))
+
+    panel.reset_stats()
+    if args.profile:
+        PROFILE.enable()
+    for i in range(300):
+        if i % 3 == 0:
+            Pin.drive(12, 0)
+            Pin.drive(12, 1)
+        esp.process()
+        clock.advance(10)
+    print('drive     {0:>7} bytes {1:>5} txn  speed {2} rpm {3}'.format(
+        panel.nbytes, panel.txn, esp.curr_speed, esp.curr_rpm))
+    print('digest    {0}'.format(panel.digest()))
+    if args.profile:
+        PROFILE.disable()
+        PROFILE.report()
+    if args.ascii:
+        print(panel.ascii(40, 0, 200, 160))
+
+
+def replay_trace(args, clock, cwd):
+    import config  # type: ignore
+    import main as dashboard  # type: ignore
+    from inputtrace import ReplayInputs  # type: ignore
+    from profiler import PROFILE  # type: ignore
+    from sim.replay import drive_scenario, replay
+
+    if args.trace == 'drive':
+        data = drive_scenario()
+    else:
+        with open(os.path.join(cwd, args.trace), 'rb') as f:
+            data = f.read()
+    inputs = ReplayInputs(data)
+    panel = sim.ILI9341Panel(config.spi_ili, dc=15)
+    outer = dashboard.OuterDisplay(max_speed=200, max_rpm=8000)
+    esp = dashboard.ESP32(outer_display=outer, max_speed=200, max_rpm=8000,
+                          idle_rpm=800, ticks_ms=clock.ticks_ms, inputs=inputs)
+    panel.reset_stats()
+    if args.profile:
+        PROFILE.enable()
+    t0 = time.perf_counter()
+    sim_ms = replay(esp, inputs, clock)
+    wall_ms = (time.perf_counter() - t0) * 1000
+    print('replay    {0} records, {1} ms simulated in {2:.0f} ms ({3:.0f}x real time)'
+          .format(len(inputs.records), sim_ms, wall_ms, sim_ms / max(wall_ms, 1)))
+    print('outer     {0:>7} bytes {1:>5} txn  speed {2} fuel {3} mp'.format(
+        panel.nbytes, panel.txn, esp.curr_speed, esp.curr_fuel_mp))
+    print('digest    {0}'.format(panel.digest()))
+    if args.profile:
+        PROFILE.disable()
+        PROFILE.report()
+
+
+if __name__ == '__main__':
+    main()
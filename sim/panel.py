@@ -0,0 +1,108 @@
+"""ILI9341 command stream decoder."""
+
+SET_COLUMN = 0x2A
+SET_PAGE = 0x2B
+WRITE_RAM = 0x2C
+
+
+class ILI9341Panel(object):
+    """Decode what Display writes to a fake SPI bus into RGB565 pixels.
+
+    Note:  Pixels are stored as the big-endian words sent on the bus, in
+    column/page (host) coordinates.  Statistics count SPI writes
+    (transactions), commands and bytes.
+    """
+
+    def __init__(self, spi, dc, width=240, height=320):
+        """Initialize panel.
+
+        Args:
+            spi (machine.SPI): Fake bus the display writes to.
+            dc (int): Pin number of the display's DC line.
+            width, height (Optional int): Panel size (default 240 x 320).
+        """
+        self.width = width
+        self.height = height
+        self.dc = dc
+        self.px = [0] * (width * height)
+        self.cmd = None
+        self.args = bytearray()
+        self.x0 = self.x1 = self.y0 = self.y1 = 0
+        self.cx = self.cy = 0
+        self.pending = None
+        self.commands = {}  # command -> count
+        self.reset_stats()
+        from machine import Pin  # type: ignore  # sim.install() puts it on sys.path
+        self._level = Pin.level
+        spi.sink = self.feed
+
+    def reset_stats(self):
+        """Zero the transaction, command and byte counters."""
+        self.txn = 0
+        self.cmds = 0
+        self.nbytes = 0
+        self.commands = {}
+
+    def feed(self, data):
+        """Consume one SPI write."""
+        self.txn += 1
+        self.nbytes += len(data)
+        if self._level(self.dc) == 0:
+            for c in data:
+                self.cmd = c
+                self.args = bytearray()
+                self.cmds += 1
+                self.commands[c] = self.commands.get(c, 0) + 1
+                if c == WRITE_RAM:
+                    self.cx = self.x0
+                    self.cy = self.y0
+                    self.pending = None
+            return
+        if self.cmd in (SET_COLUMN, SET_PAGE):
+            self.args += data
+            if len(self.args) >= 4:
+                a = self.args
+                start = (a[0] << 8) | a[1]
+                end = (a[2] << 8) | a[3]
+                if self.cmd == SET_COLUMN:
+                    self.x0, self.x1 = start, end
+                else:
+                    self.y0, self.y1 = start, end
+        elif self.cmd == WRITE_RAM:
+            self._pixels(bytes(data))
+        else:
+            self.args += data
+
+    def _pixels(self, data):
+        if self.pending is not None:
+            data = bytes([self.pending]) + data
+            self.pending = None
+        w = self.width
+        px = self.px
+        for i in range(len(data) // 2):
+            if 0 <= self.cx < w and 0 <= self.cy < self.height:
+                px[self.cy * w + self.cx] = (data[2 * i] << 8) | data[2 * i + 1]
+            self.cx += 1
+            if self.cx > self.x1:
+                self.cx = self.x0
+                self.cy += 1
+                if self.cy > self.y1:
+                    self.cy = self.y0
+        if len(data) & 1:
+            self.pending = data[-1]
+
+    def pixel(self, x, y):
+        """Return RGB565 color at x, y."""
+        return self.px[y * self.width + x]
+
+    def digest(self):
+        """Return md5 hex digest of the framebuffer (for pixel-exact checks)."""
+        import hashlib
+        return hashlib.md5(str(self.px).encode()).hexdigest()
+
+    def ascii(self, x0, y0, x1, y1):
+        """Return the box as text: '.' for black, '#' for anything else."""
+        return '\n'.join(
+            ''.join('.' if self.px[y * self.width + x] == 0 else '#'
+                    for x in range(x0, x1))
+            for y in range(y0, y1))
@@ -0,0 +1,63 @@
+"""Replay button traces through ESP32 on the virtual clock.
+
+Call sim.install() first; the dashboard modules are imported lazily.
+"""
+import io
+
+STEP_MS = 10  # ESP32.process period, as the Scheduler runs it
+
+
+def drive_scenario():
+    """Return trace bytes for idle -> full throttle -> coast -> refuel.
+
+    The dashboard boots with an empty tank, so the trace first holds the
+    refuel button for eleven seconds.  Then three seconds of idle, 45
+    throttle taps 100 ms apart (0 to 200 km/h), twenty seconds of coasting
+    with the left blinker on for the first five, the refuel button held
+    for fifteen seconds (braking, then topping up) and two more seconds of
+    idle.
+    """
+    from inputtrace import TraceWriter  # type: ignore
+    from main import BTN_LEFT, BTN_GAS, BTN_THROTTLE, BUTTON_PINS  # type: ignore
+
+    n = len(BUTTON_PINS)
+    taps = [0] * n
+    taps[BTN_THROTTLE] = 1
+    out = io.BytesIO()
+    w = TraceWriter(out, n)
+    t = 0
+    w.add(t, 1 << BTN_GAS)
+    t += 11000
+    w.add(t, 0)
+    t += 3000
+    for _ in range(45):
+        w.add(t, 1 << BTN_THROTTLE, taps)
+        w.add(t + 40, 0)
+        t += 100
+    w.add(t, 1 << BTN_LEFT)
+    w.add(t + 5000, 0)
+    t += 20000
+    w.add(t, 1 << BTN_GAS)
+    t += 15000
+    w.add(t, 0)
+    w.add(t + 2000, 0)
+    return out.getvalue()
+
+
+def replay(esp, inputs, clock, step_ms=STEP_MS):
+    """Step esp through the whole trace as fast as the host allows.
+
+    Args:
+        esp (ESP32): Dashboard built with inputs and clock.ticks_ms.
+        inputs (ReplayInputs): Trace being played.
+        clock (sim.Clock): Virtual clock behind esp.ticks_ms.
+        step_ms (Optional int): Simulated time per process() call.
+    Returns:
+        int: Simulated milliseconds replayed.
+    """
+    start = clock.ticks_ms()
+    while not inputs.done():
+        esp.process()
+        clock.advance(step_ms)
+    esp.process()
+    return clock.ticks_ms() - start
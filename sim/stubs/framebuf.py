@@ -0,0 +1,207 @@
+"""Host stand-in for the MicroPython framebuf module.
+
+Pixel layouts, stride rounding and the buffer size check follow
+modframebuf.c, so buffers built here are valid on the board.  text() uses
+a deterministic stand-in font, not the board's 8x8 font: text is
+pixel-stable between runs, not identical to hardware.
+"""
+MONO_VLSB = 0
+RGB565 = 1
+GS4_HMSB = 2
+MONO_HLSB = 3
+MONO_HMSB = 4
+GS2_HMSB = 5
+GS8 = 6
+MVLSB = MONO_VLSB
+
+
+def _glyph(ch):
+    """Return 8 column bytes (MONO_VLSB) for ch."""
+    o = ord(ch)
+    if o == 32:
+        return [0] * 8
+    return [0, (o * 37) & 0x7f, (o * 11) & 0x7f | 1, 0x41,
+            (o * 53) & 0x7f, (o * 7) & 0x7f | 0x40, 0x3e, 0]
+
+
+class FrameBuffer(object):
+    """Pure Python FrameBuffer for the formats above."""
+
+    def __init__(self, buf, width, height, format, stride=None):
+        self.buf = buf
+        self.width = width
+        self.height = height
+        self.format = format
+        stride = width if stride is None else stride
+        # Rows start on a byte
+        if format in (MONO_HLSB, MONO_HMSB):
+            stride = (stride + 7) & ~7
+        elif format == GS2_HMSB:
+            stride = (stride + 3) & ~3
+        elif format == GS4_HMSB:
+            stride = (stride + 1) & ~1
+        self.stride = stride
+        rows = (height + 7) & ~7 if format == MONO_VLSB else height
+        bpp = {MONO_VLSB: 1, MONO_HLSB: 1, MONO_HMSB: 1, GS2_HMSB: 2,
+               GS4_HMSB: 4, GS8: 8, RGB565: 16}[format]
+        if stride * rows * bpp // 8 > len(buf):
+            raise ValueError('buffer too small')
+
+    def _get(self, x, y):
+        b = self.buf
+        f = self.format
+        if f == RGB565:
+            i = (y * self.stride + x) * 2
+            return b[i] | (b[i + 1] << 8)
+        if f == GS8:
+            return b[y * self.stride + x]
+        if f == GS4_HMSB:
+            v = b[(y * self.stride + x) >> 1]
+            return v & 0xF if x & 1 else v >> 4
+        if f == GS2_HMSB:
+            v = b[(y * self.stride + x) >> 2]
+            return (v >> ((x & 3) * 2)) & 3
+        if f == MONO_HLSB:
+            return (b[(y * self.stride + x) >> 3] >> (7 - (x & 7))) & 1
+        if f == MONO_HMSB:
+            return (b[(y * self.stride + x) >> 3] >> (x & 7)) & 1
+        return (b[(y >> 3) * self.stride + x] >> (y & 7)) & 1
+
+    def _set(self, x, y, c):
+        b = self.buf
+        f = self.format
+        if f == RGB565:
+            i = (y * self.stride + x) * 2
+            b[i] = c & 0xFF
+            b[i + 1] = (c >> 8) & 0xFF
+        elif f == GS8:
+            b[y * self.stride + x] = c & 0xFF
+        elif f == GS4_HMSB:
+            i = (y * self.stride + x) >> 1
+            if x & 1:
+                b[i] = (b[i] & 0xF0) | (c & 0xF)
+            else:
+                b[i] = (b[i] & 0x0F) | ((c & 0xF) << 4)
+        elif f == GS2_HMSB:
+            i = (y * self.stride + x) >> 2
+            s = (x & 3) * 2
+            b[i] = (b[i] & ~(3 << s) & 0xFF) | ((c & 3) << s)
+        elif f in (MONO_HLSB, MONO_HMSB):
+            i = (y * self.stride + x) >> 3
+            m = 0x80 >> (x & 7) if f == MONO_HLSB else 1 << (x & 7)
+            b[i] = (b[i] | m) if c else (b[i] & ~m & 0xFF)
+        else:
+            i = (y >> 3) * self.stride + x
+            m = 1 << (y & 7)
+            b[i] = (b[i] | m) if c else (b[i] & ~m & 0xFF)
+
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        if c is None:
+            return self._get(x, y)
+        self._set(x, y, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + w, self.width)
+        y1 = min(y + h, self.height)
+        for yy in range(y0, y1):
+            for xx in range(x0, x1):
+                self._set(xx, yy, c)
+
+    def fill(self, c):
+        self.fill_rect(0, 0, self.width, self.height, c)
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            return self.fill_rect(x, y, w, h, c)
+        self.fill_rect(x, y, w, 1, c)
+        self.fill_rect(x, y + h - 1, w, 1, c)
+        self.fill_rect(x, y, 1, h, c)
+        self.fill_rect(x + w - 1, y, 1, h, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        # Same Bresenham walk as modframebuf.c
+        dx = x2 - x1
+        if dx > 0:
+            sx = 1
+        else:
+            dx = -dx
+            sx = -1
+        dy = y2 - y1
+        if dy > 0:
+            sy = 1
+        else:
+            dy = -dy
+            sy = -1
+        steep = dy > dx
+        if steep:
+            x1, y1 = y1, x1
+            dx, dy = dy, dx
+            sx, sy = sy, sx
+        e = 2 * dy - dx
+        for _ in range(dx):
+            if steep:
+                self.pixel(y1, x1, c)
+            else:
+                self.pixel(x1, y1, c)
+            while e >= 0:
+                y1 += sy
+                e -= 2 * dx
+            x1 += sx
+            e += 2 * dy
+        self.pixel(x2, y2, c)
+
+    def text(self, s, x, y, c=1):
+        for ch in s:
+            for j, col in enumerate(_glyph(ch)):
+                for k in range(8):
+                    if col >> k & 1:
+                        self.pixel(x + j, y + k, c)
+            x += 8
+
+    def blit(self, src, x, y, key=-1, palette=None):
+        for sy in range(src.height):
+            yy = y + sy
+            if not 0 <= yy < self.height:
+                continue
+            for sx in range(src.width):
+                xx = x + sx
+                if not 0 <= xx < self.width:
+                    continue
+                c = src._get(sx, sy)
+                if palette is not None:
+                    c = palette._get(c, 0)
+                if c != key:
+                    self._set(xx, yy, c)
+
+    def scroll(self, xstep, ystep):
+        # Same walk as modframebuf.c: pixels shifted in keep their old value
+        if xstep < 0:
+            sx, xend, dx = 0, self.width + xstep, 1
+            if xend <= 0:
+                return
+        else:
+            sx, xend, dx = self.width - 1, xstep - 1, -1
+            if xend >= sx:
+                return
+        if ystep < 0:
+            y, yend, dy = 0, self.height + ystep, 1
+            if yend <= 0:
+                return
+        else:
+            y, yend, dy = self.height - 1, ystep - 1, -1
+            if yend >= y:
+                return
+        while y != yend:
+            for x in range(sx, xend, dx):
+                self._set(x, y, self._get(x - xstep, y - ystep))
+            y += dy
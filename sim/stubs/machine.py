@@ -0,0 +1,83 @@
+"""Host stand-in for the MicroPython machine module (Pin, SPI)."""
+
+
+class Pin(object):
+    """GPIO pin; levels are shared per pin number so tests can drive them."""
+    IN = 1
+    OUT = 3
+    PULL_UP = 2
+    IRQ_FALLING = 2
+    IRQ_RISING = 1
+
+    _levels = {}
+    _pins = {}
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self.mode = mode
+        self.handler = None
+        self.trigger = 0
+        if value is not None:
+            Pin._levels[id] = 1 if value else 0
+        else:
+            Pin._levels.setdefault(id, 1 if pull == Pin.PULL_UP else 0)
+        Pin._pins[id] = self
+
+    @classmethod
+    def level(cls, id):
+        """Return level of pin number id."""
+        return cls._levels.get(id, 0)
+
+    @classmethod
+    def drive(cls, id, value):
+        """Set level of pin number id from outside, firing its IRQ on an edge."""
+        old = cls._levels.get(id, 0)
+        value = 1 if value else 0
+        cls._levels[id] = value
+        pin = cls._pins.get(id)
+        if pin is None or pin.handler is None or old == value:
+            return
+        if (value == 0 and pin.trigger & Pin.IRQ_FALLING) or \
+                (value == 1 and pin.trigger & Pin.IRQ_RISING):
+            pin.handler(pin)
+
+    def init(self, mode=-1, pull=-1, value=None):
+        if value is not None:
+            Pin._levels[self.id] = 1 if value else 0
+
+    def value(self, v=None):
+        if v is None:
+            return Pin._levels.get(self.id, 0)
+        Pin._levels[self.id] = 1 if v else 0
+
+    __call__ = value
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    def irq(self, handler=None, trigger=None, hard=False):
+        self.trigger = trigger or 0
+        self.handler = handler
+
+
+class SPI(object):
+    """SPI bus that counts writes and hands each one to an optional sink."""
+
+    def __init__(self, id, baudrate=0, **kw):
+        self.id = id
+        self.baudrate = baudrate
+        self.writes = 0
+        self.nbytes = 0
+        self.sink = None
+
+    def write(self, data):
+        self.writes += 1
+        self.nbytes += len(data)
+        if self.sink is not None:
+            self.sink(bytes(data))
+
+    def deinit(self):
+        pass
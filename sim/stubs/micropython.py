@@ -0,0 +1,22 @@
+"""Host stand-in for the MicroPython micropython module."""
+
+
+def const(x):
+    return x
+
+
+def schedule(fn, arg):
+    fn(arg)
+    return True
+
+
+def alloc_emergency_exception_buf(n):
+    pass
+
+
+def heap_lock():
+    return 0
+
+
+def heap_unlock():
+    return 0
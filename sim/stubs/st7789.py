@@ -0,0 +1,85 @@
+"""Host stand-in for the st7789_mpy C driver, drawing into a framebuffer."""
+
+
+class ST7789(object):
+    """ST7789 with the subset of the C driver API the dashboard uses.
+
+    Note:  px holds big-endian RGB565 words as they would reach the panel;
+    calls and nbytes count driver calls and pixel bytes sent.
+    """
+
+    def __init__(self, spi, width, height, reset=None, cs=None, dc=None,
+                 backlight=None, rotation=0):
+        if rotation in (1, 3):
+            width, height = height, width
+        self._w = width
+        self._h = height
+        self.spi = spi
+        self.px = [0] * (width * height)
+        self.calls = 0
+        self.nbytes = 0
+
+    def init(self):
+        pass
+
+    def backlight_on(self):
+        pass
+
+    def width(self):
+        return self._w
+
+    def height(self):
+        return self._h
+
+    def _rect(self, x, y, w, h, color):
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + w, self._w)
+        y1 = min(y + h, self._h)
+        for yy in range(y0, y1):
+            base = yy * self._w
+            for xx in range(x0, x1):
+                self.px[base + xx] = color
+        if x1 > x0 and y1 > y0:
+            self.nbytes += (x1 - x0) * (y1 - y0) * 2
+
+    def fill(self, color):
+        self.calls += 1
+        self._rect(0, 0, self._w, self._h, color)
+
+    def fill_rect(self, x, y, w, h, color):
+        self.calls += 1
+        self._rect(x, y, w, h, color)
+
+    def hline(self, x, y, w, color):
+        self.calls += 1
+        self._rect(x, y, w, 1, color)
+
+    def vline(self, x, y, h, color):
+        self.calls += 1
+        self._rect(x, y, 1, h, color)
+
+    def pixel(self, x, y, color):
+        self.calls += 1
+        self._rect(x, y, 1, 1, color)
+
+    def rect(self, x, y, w, h, color):
+        self.calls += 1
+        self._rect(x, y, w, 1, color)
+        self._rect(x, y + h - 1, w, 1, color)
+        self._rect(x, y, 1, h, color)
+        self._rect(x + w - 1, y, 1, h, color)
+
+    def blit_buffer(self, buf, x, y, w, h):
+        self.calls += 1
+        buf = bytes(buf)
+        for row in range(h):
+            yy = y + row
+            if not 0 <= yy < self._h:
+                continue
+            for col in range(w):
+                xx = x + col
+                if 0 <= xx < self._w:
+                    i = (row * w + col) * 2
+                    self.px[yy * self._w + xx] = (buf[i] << 8) | buf[i + 1]
+        self.nbytes += w * h * 2
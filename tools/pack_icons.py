@@ -0,0 +1,185 @@
+"""Pack icons into the RGB565 container read by core/assets.py (host only).
+
+    python tools/pack_icons.py -o core/icons.bin fuel.png oil.png
+    python tools/pack_icons.py -o core/icons.bin core/icons.py:gas
+
+PNG inputs (8-bit gray, RGB, RGBA or palette, not interlaced) are decoded
+with the standard library only.  Alpha is composited onto --background.
+MODULE.py:NAME packs a legacy list of RGB565 values; its size defaults to
+48x48 (--size).  Icon names are the file stem or NAME (at most 12 bytes).
+"""
+import argparse
+import ast
+import os
+import struct
+import sys
+import zlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'core'))
+from assets import MAGIC, VERSION, HEADER, ENTRY, HEADER_SIZE, ENTRY_SIZE  # noqa: E402
+
+
+def rgb565(r, g, b):
+    """Return RGB565 value of an 8-bit RGB color."""
+    return (r & 0xf8) << 8 | (g & 0xfc) << 3 | b >> 3
+
+
+def _paeth(a, b, c):
+    p = a + b - c
+    pa = abs(p - a)
+    pb = abs(p - b)
+    pc = abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def read_png(path):
+    """Decode a PNG file.
+
+    Returns:
+        tuple: (width, height, rows) with rows a list of lists of
+        (r, g, b, a) tuples.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:8] != b'\x89PNG\r\n\x1a\n':
+        raise ValueError('{0}: not a PNG file'.format(path))
+    pos = 8
+    idat = []
+    palette = []
+    trns = b''
+    while pos < len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b'IHDR':
+            w, h, depth, ctype, _, _, interlace = struct.unpack('>IIBBBBB', chunk)
+        elif kind == b'PLTE':
+            palette = [tuple(chunk[i:i + 3]) for i in range(0, length, 3)]
+        elif kind == b'tRNS':
+            trns = chunk
+        elif kind == b'IDAT':
+            idat.append(chunk)
+        elif kind == b'IEND':
+            break
+    channels = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}.get(ctype)
+    if depth != 8 or interlace or channels is None:
+        raise ValueError('{0}: only 8-bit non-interlaced PNG is supported'
+                         .format(path))
+    raw = zlib.decompress(b''.join(idat))
+    stride = w * channels
+    prev = bytearray(stride)
+    rows = []
+    pos = 0
+    for _ in range(h):
+        ftype = raw[pos]
+        line = bytearray(raw[pos + 1:pos + 1 + stride])
+        pos += 1 + stride
+        for i in range(stride):
+            a = line[i - channels] if i >= channels else 0
+            b = prev[i]
+            c = prev[i - channels] if i >= channels else 0
+            if ftype == 1:
+                line[i] = (line[i] + a) & 0xFF
+            elif ftype == 2:
+                line[i] = (line[i] + b) & 0xFF
+            elif ftype == 3:
+                line[i] = (line[i] + ((a + b) >> 1)) & 0xFF
+            elif ftype == 4:
+                line[i] = (line[i] + _paeth(a, b, c)) & 0xFF
+        prev = line
+        row = []
+        for x in range(w):
+            px = line[x * channels:(x + 1) * channels]
+            if ctype == 0:
+                row.append((px[0], px[0], px[0], 255))
+            elif ctype == 2:
+                row.append((px[0], px[1], px[2], 255))
+            elif ctype == 3:
+                alpha = trns[px[0]] if px[0] < len(trns) else 255
+                row.append(palette[px[0]] + (alpha,))
+            elif ctype == 4:
+                row.append((px[0], px[0], px[0], px[1]))
+            else:
+                row.append(tuple(px))
+        rows.append(row)
+    return w, h, rows
+
+
+def png_to_rgb565(path, background=(0, 0, 0)):
+    """Return (width, height, list of RGB565 values) of a PNG file."""
+    w, h, rows = read_png(path)
+    pixels = []
+    for row in rows:
+        for r, g, b, a in row:
+            if a < 255:
+                r = (r * a + background[0] * (255 - a)) // 255
+                g = (g * a + background[1] * (255 - a)) // 255
+                b = (b * a + background[2] * (255 - a)) // 255
+            pixels.append(rgb565(r, g, b))
+    return w, h, pixels
+
+
+def module_list(spec):
+    """Return RGB565 values of list NAME in MODULE.py given 'MODULE.py:NAME'."""
+    path, name = spec.rsplit(':', 1)
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and getattr(node.targets[0], 'id', None) == name):
+            return name, ast.literal_eval(node.value)
+    raise ValueError('{0}: no list {1}'.format(path, name))
+
+
+def pack(icons):
+    """Return container bytes for a list of (name, w, h, rgb565 values)."""
+    offset = HEADER_SIZE + len(icons) * ENTRY_SIZE
+    header = [struct.pack(HEADER, MAGIC, VERSION, len(icons))]
+    data = []
+    for name, w, h, pixels in icons:
+        key = name.encode()
+        if len(key) > 12:
+            raise ValueError('icon name too long: {0}'.format(name))
+        if len(pixels) != w * h:
+            raise ValueError('{0}: {1} pixels, expected {2}x{3}'
+                             .format(name, len(pixels), w, h))
+        header.append(struct.pack(ENTRY, key, w, h, offset))
+        data.append(struct.pack('>{0}H'.format(len(pixels)), *pixels))
+        offset += w * h * 2
+    return b''.join(header + data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('inputs', nargs='+', help='PNG files or MODULE.py:NAME')
+    parser.add_argument('-o', '--output', required=True, help='pack file')
+    parser.add_argument('--size', default='48x48',
+                        help='WxH of MODULE.py:NAME lists (default 48x48)')
+    parser.add_argument('--background', default='000000',
+                        help='RRGGBB that PNG alpha is blended onto')
+    args = parser.parse_args(argv)
+
+    bg = int(args.background, 16)
+    background = (bg >> 16, (bg >> 8) & 0xFF, bg & 0xFF)
+    lw, lh = (int(v) for v in args.size.split('x'))
+    icons = []
+    for spec in args.inputs:
+        if spec.lower().endswith('.png'):
+            name = os.path.splitext(os.path.basename(spec))[0]
+            w, h, pixels = png_to_rgb565(spec, background)
+        else:
+            name, pixels = module_list(spec)
+            w, h = lw, lh
+        icons.append((name, w, h, pixels))
+        print('{0:<12} {1}x{2}'.format(name, w, h))
+
+    with open(args.output, 'wb') as f:
+        f.write(pack(icons))
+    print('{0}: {1} icons, {2} bytes'.format(
+        args.output, len(icons), os.path.getsize(args.output)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""Encode an image as a palette-indexed sprite for core/sprite.py (host only).
+
+    python tools/pack_sprite.py -o core/dial.spr dial.png
+    python tools/pack_sprite.py -o core/bg.spr --size 240x320 bg.raw
+
+Inputs are PNG (see pack_icons.py) or raw big-endian RGB565 (.raw, needs
+--size).  At most 256 colors.  The smallest of raw (1/2/4/8 bpp) and RLE
+is written unless --raw or --rle is given.
+"""
+import argparse
+import os
+import struct
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+from pack_icons import png_to_rgb565  # noqa: E402
+
+# Must match core/sprite.py (which needs framebuf, so is not imported here)
+MAGIC = b'PSPR'
+HEADER = '<4sBBHHH'
+FLAG_RLE = 0x01
+
+
+def row_bytes(w, bpp):
+    """Return bytes per packed row of w pixels at bpp bits."""
+    return (w * bpp + 7) // 8
+
+
+def palette_of(pixels):
+    """Return (colors, indices); colors sorted by frequency, most first."""
+    counts = {}
+    for c in pixels:
+        counts[c] = counts.get(c, 0) + 1
+    colors = sorted(counts, key=lambda c: -counts[c])
+    if len(colors) > 256:
+        raise ValueError('{0} colors, at most 256 allowed'.format(len(colors)))
+    lookup = dict((c, i) for i, c in enumerate(colors))
+    return colors, [lookup[c] for c in pixels]
+
+
+def bpp_for(n):
+    """Return smallest supported bits per pixel for n colors."""
+    for bpp in (1, 2, 4, 8):
+        if n <= 1 << bpp:
+            return bpp
+
+
+def pack_raw(indices, w, h, bpp):
+    """Pack indices in the FrameBuffer layout for bpp (rows byte aligned)."""
+    stride = row_bytes(w, bpp)
+    out = bytearray(stride * h)
+    for y in range(h):
+        base = y * stride
+        for x in range(w):
+            v = indices[y * w + x]
+            if bpp == 8:
+                out[base + x] = v
+            elif bpp == 4:  # GS4_HMSB: first pixel in the high nibble
+                out[base + (x >> 1)] |= v << (4 if x & 1 == 0 else 0)
+            elif bpp == 2:  # GS2_HMSB: first pixel in the low bits
+                out[base + (x >> 2)] |= v << ((x & 3) * 2)
+            else:  # MONO_HLSB: first pixel in the high bit
+                out[base + (x >> 3)] |= v << (7 - (x & 7))
+    return bytes(out)
+
+
+def pack_rle(indices):
+    """Run-length encode indices into the sprite token stream."""
+    out = bytearray()
+    literal = []
+    i = 0
+    n = len(indices)
+    while i < n:
+        run = 1
+        while i + run < n and run < 128 and indices[i + run] == indices[i]:
+            run += 1
+        if run >= 2:
+            if literal:
+                out.append(len(literal) - 1)
+                out.extend(literal)
+                literal = []
+            out.append(0x80 | (run - 1))
+            out.append(indices[i])
+            i += run
+        else:
+            literal.append(indices[i])
+            if len(literal) == 128:
+                out.append(127)
+                out.extend(literal)
+                literal = []
+            i += 1
+    if literal:
+        out.append(len(literal) - 1)
+        out.extend(literal)
+    return bytes(out)
+
+
+def encode(pixels, w, h, mode=None):
+    """Return sprite file bytes for w x h RGB565 pixels.
+
+    Args:
+        mode (Optional string): 'raw', 'rle' or None for the smaller one.
+    """
+    colors, indices = palette_of(pixels)
+    bpp = bpp_for(len(colors))
+    raw = pack_raw(indices, w, h, bpp) if mode != 'rle' else None
+    rle = pack_rle(indices) if mode != 'raw' else None
+    if rle is not None and (raw is None or len(rle) < len(raw)):
+        flags, data = FLAG_RLE, rle
+    else:
+        flags, data = 0, raw
+    header = struct.pack(HEADER, MAGIC, bpp, flags, w, h, len(colors))
+    palette = struct.pack('>{0}H'.format(len(colors)), *colors)
+    return header + palette + data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('input', help='PNG or raw RGB565 file')
+    parser.add_argument('-o', '--output', required=True, help='sprite file')
+    parser.add_argument('--size', help='WxH of a raw input')
+    parser.add_argument('--background', default='000000',
+                        help='RRGGBB that PNG alpha is blended onto')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--raw', action='store_const', const='raw', dest='mode')
+    group.add_argument('--rle', action='store_const', const='rle', dest='mode')
+    args = parser.parse_args(argv)
+
+    if args.input.lower().endswith('.png'):
+        bg = int(args.background, 16)
+        w, h, pixels = png_to_rgb565(
+            args.input, (bg >> 16, (bg >> 8) & 0xFF, bg & 0xFF))
+    else:
+        if not args.size:
+            parser.error('--size is required for raw input')
+        w, h = (int(v) for v in args.size.split('x'))
+        with open(args.input, 'rb') as f:
+            data = f.read(w * h * 2)
+        pixels = list(struct.unpack('>{0}H'.format(w * h), data))
+
+    out = encode(pixels, w, h, args.mode)
+    with open(args.output, 'wb') as f:
+        f.write(out)
+    print('{0}: {1}x{2}, {3} bytes ({4:.1f}x smaller than RGB565)'.format(
+        args.output, w, h, len(out), w * h * 2 / len(out)))
+
+
+if __name__ == '__main__':
+    main()